@@ -6,11 +6,56 @@ ASSETS_DIR = os.path.join(BASE_DIR, 'assets')
 IMAGES_DIR = os.path.join(ASSETS_DIR, 'images')
 SOUNDS_DIR = os.path.join(ASSETS_DIR, 'sounds')
 SAVES_DIR = os.path.join(BASE_DIR, 'saves')
+PROFILES_DIR = os.path.join(BASE_DIR, 'profiles')
 
 # Screen settings
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
-FPS = 60
+FPS = 60  # Render frame cap (0 = uncapped)
+
+# Simulation timing
+TICK_RATE = 60  # Fixed simulation updates per second
+TICK_MS = 1000 / TICK_RATE
+MAX_CATCHUP_TICKS = 5  # Ticks allowed per rendered frame before dropping time
+
+# Profiler settings
+PROFILER_HISTORY = 300  # Frames kept in the timing ring buffer
+PROFILER_HITCH_MS = 33.3  # Frames slower than this count as hitches
+PROFILER_OVERLAY_REFRESH_MS = 250  # How often the overlay panel is redrawn
+
+# Texture atlas settings
+ATLAS_PAGE_SIZE = 1024  # Width and height of each atlas page in pixels
+ATLAS_PADDING = 1  # Transparent gap between packed frames
+
+# HUD settings
+RADAR_REFRESH_HZ = 10  # Radar contact redraws per second (0 = every frame)
+
+# Particle settings
+PARTICLE_BUDGET = 8000  # Preallocated particle slots shared by every effect
+PARTICLE_ALPHA_LEVELS = 16  # Fade steps with a prerendered sprite each
+PARTICLE_QUALITY = 1.0  # Burst size multiplier (e.g. 0.5 for low quality)
+PARTICLE_SOFT_LIMIT = 0.75  # Share of an effect's budget after which its bursts shrink
+PARTICLE_CULL_MARGIN = 64  # Emitters this far outside the view still emit
+PARTICLE_PRIORITIES = {  # Share of the budget each effect may fill
+    'death': 1.0,
+    'hit': 0.9,
+    'attack': 0.75,
+    'trail': 0.5
+}
+
+# Effect settings
+EFFECT_TEXT_POOL = 32  # Floating text labels alive at once; the oldest is recycled
+EFFECT_TEXT_LIFETIME = 60  # Ticks a floating text label stays up
+EFFECT_TEXT_RISE = 0.5  # Pixels a floating text label rises per tick
+EFFECT_TEXT_SIZE = 28
+
+# Text rendering
+TEXT_CACHE_SIZE = 256  # Composed string surfaces kept in the LRU
+TEXT_ATLAS_PAGE_SIZE = 512  # Glyph atlas page width and height
+
+# Asset loading
+PRELOAD_SLICE_MS = 4  # Main-thread time per menu frame spent installing preloaded assets
+ASSET_CACHE_DIR = os.path.join(BASE_DIR, '.cache', 'assets')  # Decoded, prescaled images
 
 # Colors
 WHITE = (255, 255, 255)
@@ -68,15 +113,48 @@ DEFAULT_WEAPON_RANGE = 50
 # Combat settings
 INVULNERABILITY_FRAMES = 60
 KNOCKBACK_FORCE = 10
+COLLISION_CELL_SIZE = 16  # Occupancy grid cell for ruling out obstacle collisions of many movers at once
 
 # Terrain settings
 CHUNK_SIZE = 128  # Size of terrain chunks in pixels
+TERRAIN_BAKE_SIZE = 512  # Terrain is baked into tiles of this many pixels (a multiple of CHUNK_SIZE)
+TERRAIN_CACHE_SIZE = 24  # Baked terrain tiles kept in memory (~1 MB each)
+
+# World streaming
+TERRAIN_ACTIVE_RADIUS = 8  # Chunks around the player kept loaded, generated synchronously
+TERRAIN_PREFETCH_RADIUS = 11  # Chunks out to this radius are generated ahead on a worker thread
+TERRAIN_CHUNK_CACHE = 1024  # Loaded chunks kept before the least recently used are evicted
+TERRAIN_NOISE_SCALE = 12  # Chunks per noise cell; larger means broader regions
+TERRAIN_TYPES = ['sea', 'desert', 'hellscape']  # Index is the type's code in the terrain grid
+TERRAIN_BANDS = [(0.45, 'sea'), (0.75, 'desert'), (1.0, 'hellscape')]  # Noise upper bound -> terrain type
+TERRAIN_OBSTACLE_CHANCE = {'sea': 0.04, 'desert': 0.1, 'hellscape': 0.15}  # Per chunk
+TERRAIN_COLORS = {
+    'sea': (0, 0, 255),
+    'desert': (255, 223, 128),
+    'hellscape': (255, 0, 0)
+}
 TERRAIN_MOVEMENT_PENALTIES = {
     'sea': 0.5,
     'desert': 0.7,
     'hellscape': 1.0
 }
 
+# Pathfinding
+PATHFINDING_CELL_SIZE = 32  # Flow field cell size in pixels
+PATHFINDING_RADIUS = 16  # Cells from the player to the edge of the flow field
+PATHFINDING_INTERVAL = 250  # Minimum milliseconds of simulation time between flow field rebuilds
+PATHFINDING_CELLS_PER_TICK = 256  # Cells a flow field rebuild settles per tick; the rest carry over to the next tick
+
+# AI scheduling
+AI_THINK_BUDGET_MS = 1.5  # Time per tick for enemy think() work in live play
+AI_THINK_MIN_PER_TICK = 32  # Enemies that think every tick, budget or not
+AI_THINK_FIXED_PER_TICK = 128  # Enemies thinking per tick while recording or replaying (no wall-clock budget)
+
+# Enemy simulation levels of detail, by distance to the camera's centre
+LOD_NEAR_RADIUS = 800  # Full simulation inside this radius; keep it beyond the screen's half-diagonal
+LOD_WAKE_RADIUS = 1600  # Reduced-rate cooldowns out to here; enemies further away sleep
+LOD_MID_INTERVAL = 4  # Ticks between updates of a mid-range enemy
+
 # Map paths
 MAPS_DIR = os.path.join(IMAGES_DIR, 'maps')
 GRASS_MAP = os.path.join(MAPS_DIR, 'grass_map.png')
@@ -1,5 +1,7 @@
+import argparse
 import os
 import sys
+import time
 
 # Add the project root directory to Python path
 project_root = os.path.dirname(os.path.abspath(__file__))
@@ -7,6 +9,29 @@ sys.path.append(project_root)
 
 from src.game import Game
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Metron-Zero")
+    parser.add_argument('--seed', type=int, help="Seed the RNG for a reproducible run")
+    parser.add_argument('--record', metavar='PATH', help="Record per-tick input and the RNG seed to PATH; "
+                        "lives after a game over go to PATH-2, PATH-3... (before the extension)")
+    parser.add_argument('--replay', metavar='PATH', help="Play back a recording made with --record")
+    parser.add_argument('--headless', action='store_true', help="Replay without a window, as fast as possible")
+    parser.add_argument('--speed', type=float, default=1.0, help="Simulation speed multiplier for windowed replays")
+    return parser.parse_args()
+
 if __name__ == '__main__':
-    game = Game()
-    game.run() 
+    args = parse_args()
+    if args.headless and not args.replay:
+        sys.exit("--headless requires --replay")
+    
+    game = Game(headless=args.headless, seed=args.seed,
+                record_path=args.record, replay_path=args.replay)
+    game.time_scale = args.speed
+    
+    if args.headless:
+        start = time.perf_counter()
+        ticks = game.run_headless()
+        elapsed = time.perf_counter() - start
+        print(f"Replayed {ticks} ticks in {elapsed:.2f}s (seed {game.seed}, score {game.score})")
+    else:
+        game.run()
@@ -0,0 +1,67 @@
+import time
+import numpy as np
+from config import *
+
+class AIScheduler:
+    """Spreads a vectorized think over ticks in round-robin slices of the agents.
+    
+    Each tick picks up where the previous one stopped, with a slice sized
+    from the measured cost per agent to fit the per-tick budget, so think
+    cost stays flat as the population grows and only staleness (ticks since
+    an agent last thought) goes up. At least AI_THINK_MIN_PER_TICK agents
+    think every tick, and no agent thinks twice in one tick.
+    
+    A wall-clock budget would make the simulation depend on machine speed,
+    so with adaptive=False (runs being recorded or replayed) the scheduler
+    thinks a fixed AI_THINK_FIXED_PER_TICK agents per tick instead.
+    """
+    def __init__(self, budget_ms=AI_THINK_BUDGET_MS, adaptive=True):
+        self.budget_ms = budget_ms
+        self.adaptive = adaptive
+        self.cursor = 0
+        self.tick = 0
+        self.thought = 0  # Agents thought in the last tick
+        self.think_ms = 0.0  # Time spent thinking in the last tick
+        self.agent_ms = None  # Measured cost per agent of the last batch
+    
+    def run_batch(self, count, think):
+        """Call think(indices) once with this tick's round-robin slice of range(count).
+        
+        The slice is sized from the cost per agent measured on the previous
+        batch, so a cheap vectorized think covers the whole population every tick.
+        """
+        self.tick += 1
+        if not count:
+            self.thought = 0
+            self.think_ms = 0.0
+            return
+        
+        if not self.adaptive:
+            size = AI_THINK_FIXED_PER_TICK
+        elif self.agent_ms:
+            size = max(AI_THINK_MIN_PER_TICK, int(self.budget_ms / self.agent_ms))
+        else:
+            size = count
+        size = min(count, size)
+        cursor = self.cursor % count
+        
+        start = time.perf_counter()
+        think((np.arange(size) + cursor) % count)
+        self.think_ms = (time.perf_counter() - start) * 1000.0
+        self.agent_ms = self.think_ms / size
+        self.cursor = (cursor + size) % count
+        self.thought = size
+    
+    def stats(self, agents):
+        """Queue depth and staleness, in ticks, across the current population"""
+        tick = self.tick
+        staleness = [tick - agent.thought_at if agent.thought_at is not None else tick for agent in agents]
+        return {
+            'population': len(agents),
+            'thought': self.thought,
+            'queue_depth': len(agents) - self.thought,
+            'think_ms': self.think_ms,
+            'budget_ms': self.budget_ms if self.adaptive else None,
+            'max_staleness': max(staleness, default=0),
+            'mean_staleness': sum(staleness) / len(staleness) if staleness else 0.0
+        }
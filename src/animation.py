@@ -1,6 +1,7 @@
 import pygame
 import os
 from config import *  # Add this to get access to IMAGES_DIR
+from .assets import assets, FrameSet
 
 class DirectionalAnimation:
     def __init__(self, frame_width=93, frame_height=93):
@@ -12,6 +13,7 @@ class DirectionalAnimation:
             'up': [],
             'down': [],
         }
+        self.masks = {direction: [] for direction in self.animations}  # One per frame
         self.current_direction = 'down'
         self.current_frame = 0
         self.animation_timer = 0
@@ -35,40 +37,33 @@ class DirectionalAnimation:
         
         for direction, path in sprite_sheets.items():
             try:
-                sheet = pygame.image.load(path).convert_alpha()
-                self.animations[direction] = self.extract_frames(sheet)
-                print(f"Loaded {len(self.animations[direction])} frames for {direction} direction")
+                frame_set = assets.load_frames(path, self.frame_width, self.frame_height)
+                self.animations[direction] = frame_set.frames
+                self.masks[direction] = frame_set.masks
             except (pygame.error, FileNotFoundError) as e:
                 print(f"Error loading {direction} sprite sheet: {e}")
                 self.create_placeholder_frame(direction)
     
-    def extract_frames(self, sprite_sheet):
-        frames = []
-        sheet_width = sprite_sheet.get_width()
-        num_frames = max(1, sheet_width // self.frame_width)
-        
-        for i in range(num_frames):
-            frame_surface = pygame.Surface((self.frame_width, self.frame_height), pygame.SRCALPHA)
-            frame_surface.blit(sprite_sheet, (0, 0), 
-                             (i * self.frame_width, 0, self.frame_width, self.frame_height))
-            frames.append(frame_surface)
-        
-        return frames
-    
     def create_placeholder_frame(self, direction):
         """Create a single colored rectangle as placeholder for a direction"""
-        colors = {
-            'right': (255, 0, 0),    # Red
-            'left': (0, 255, 0),     # Green
-            'up': (0, 0, 255),       # Blue
-            'down': (255, 255, 0)    # Yellow
-        }
+        def build():
+            colors = {
+                'right': (255, 0, 0),    # Red
+                'left': (0, 255, 0),     # Green
+                'up': (0, 0, 255),       # Blue
+                'down': (255, 255, 0)    # Yellow
+            }
+            
+            frame = pygame.Surface((self.frame_width, self.frame_height), pygame.SRCALPHA)
+            pygame.draw.rect(frame, colors.get(direction, (128, 128, 128)), 
+                            (0, 0, self.frame_width, self.frame_height))
+            print(f"Created placeholder for {direction} direction")
+            return FrameSet([frame], assets.atlas)  # Single frame animation
         
-        frame = pygame.Surface((self.frame_width, self.frame_height), pygame.SRCALPHA)
-        pygame.draw.rect(frame, colors.get(direction, (128, 128, 128)), 
-                        (0, 0, self.frame_width, self.frame_height))
-        self.animations[direction] = [frame]  # Single frame animation
-        print(f"Created placeholder for {direction} direction")
+        key = ('player_placeholder', direction, self.frame_width, self.frame_height)
+        frame_set = assets.get_or_create(key, build)
+        self.animations[direction] = frame_set.frames
+        self.masks[direction] = frame_set.masks
     
     def update(self, dt, direction=None, is_moving=False):
         self.is_moving = is_moving
@@ -95,4 +90,9 @@ class DirectionalAnimation:
         
         # Ensure current_frame is within bounds
         self.current_frame = min(self.current_frame, len(frames) - 1)
-        return frames[self.current_frame] 
\ No newline at end of file
+        return frames[self.current_frame]
+    
+    def get_current_mask(self):
+        """Return the precomputed mask matching get_current_frame()"""
+        self.get_current_frame()  # Clamps current_frame and fills in placeholders
+        return self.masks[self.current_direction][self.current_frame]
@@ -0,0 +1,89 @@
+import hashlib
+import mmap
+import os
+import struct
+import pygame
+from config import *
+
+class AssetCache:
+    """Decoded, prescaled images kept on disk as raw RGBA buffers.
+    
+    Entries are keyed by source path, mtime, file size and target size, so
+    editing a source image simply misses the cache. Hits are memory-mapped
+    and wrapped with pygame.image.frombuffer instead of being decoded.
+    The cache is best effort: any I/O problem falls back to a normal load.
+    """
+    HEADER = struct.Struct('<4sHII')  # magic, version, width, height
+    MAGIC = b'MZAC'
+    VERSION = 1
+    
+    def __init__(self, directory=ASSET_CACHE_DIR, enabled=True):
+        self.directory = directory
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+    
+    def entry_path(self, path, size):
+        stat = os.stat(path)
+        key = f"{os.path.abspath(path)}|{stat.st_mtime_ns}|{stat.st_size}|{size}"
+        return os.path.join(self.directory, hashlib.sha1(key.encode()).hexdigest() + '.rgba')
+    
+    def load_image(self, path, size=None):
+        """Return the image at path scaled to size, from the cache when possible"""
+        if not self.enabled:
+            return decode(path, size)
+        entry = self.entry_path(path, size)  # Raises FileNotFoundError like pygame.image.load
+        image = self.read(entry)
+        if image is not None:
+            self.hits += 1
+            return image
+        
+        self.misses += 1
+        image = decode(path, size)
+        self.write(entry, image)
+        return image
+    
+    def read(self, entry):
+        try:
+            with open(entry, 'rb') as f:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        
+        header = self.HEADER.size
+        if len(data) < header:
+            return None
+        magic, version, width, height = self.HEADER.unpack_from(data)
+        if magic != self.MAGIC or version != self.VERSION or len(data) != header + width * height * 4:
+            return None
+        # The surface keeps the memoryview (and so the mapping) alive
+        return pygame.image.frombuffer(memoryview(data)[header:], (width, height), 'RGBA')
+    
+    def write(self, entry, image):
+        width, height = image.get_size()
+        temp_path = f"{entry}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(temp_path, 'wb') as f:
+                f.write(self.HEADER.pack(self.MAGIC, self.VERSION, width, height))
+                f.write(pygame.image.tobytes(image, 'RGBA'))
+            os.replace(temp_path, entry)
+        except OSError as e:
+            print(f"Warning: Could not write asset cache entry: {e}")
+    
+    def clear(self):
+        """Delete every cached buffer"""
+        if not os.path.isdir(self.directory):
+            return
+        for name in os.listdir(self.directory):
+            if name.endswith('.rgba'):
+                os.remove(os.path.join(self.directory, name))
+
+def decode(path, size=None):
+    image = pygame.image.load(path)
+    if size is not None:
+        image = pygame.transform.scale(image, size)
+    return image
+
+# Shared by the asset manager and the preloader thread
+asset_cache = AssetCache()
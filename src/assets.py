@@ -0,0 +1,197 @@
+import os
+import pygame
+from config import *
+from .atlas import TextureAtlas
+from .asset_cache import asset_cache
+
+class FrameSet:
+    """Animation frames sliced from one sheet, with flipped copies and masks baked in.
+    
+    With an atlas, frames and flipped frames are packed into it and the
+    lists hold subsurfaces of the atlas pages.
+    """
+    def __init__(self, frames, atlas=None):
+        flipped = [pygame.transform.flip(frame, True, False) for frame in frames]
+        if atlas is not None:
+            frames = [atlas.add(frame) for frame in frames]
+            flipped = [atlas.add(frame) for frame in flipped]
+        self.frames = frames
+        self.flipped = flipped
+        self.masks = [pygame.mask.from_surface(frame) for frame in frames]
+        self.flipped_masks = [pygame.mask.from_surface(frame) for frame in self.flipped]
+    
+    def memory_usage(self):
+        surfaces = sum(surface_bytes(frame) for frame in self.frames + self.flipped)
+        masks = sum(mask_bytes(mask) for mask in self.masks + self.flipped_masks)
+        return surfaces + masks
+
+class AssetManager:
+    """Process-wide cache of decoded images, sliced frame sets and sounds.
+    
+    Every asset is loaded (and converted for the display) at most once and
+    then shared by all instances that ask for it. Entries stay cached until
+    evict() or clear() is called.
+    """
+    def __init__(self):
+        self.images = {}  # (path, size, packed) -> Surface
+        self.frame_sets = {}  # (path, frame_width, frame_height) -> FrameSet
+        self.sounds = {}  # path -> Sound
+        self.generated = {}  # Caller-defined key -> object built by a factory
+        self.missing = {}  # path -> error message, so missing files fail fast
+        self.decode_count = 0
+        self.atlas = TextureAtlas()  # Shared pages for character and effect frames
+    
+    def load_image(self, path, size=None, packed=False):
+        """Return the image at path, optionally scaled to size, decoding it only once.
+        
+        Packed images are copied into the texture atlas, for sprites drawn
+        alongside animation frames.
+        """
+        key = (path, size, packed)
+        image = self.images.get(key)
+        if image is not None:
+            return image
+        
+        if packed:
+            image = self.atlas.add(self.load_image(path, size))
+        else:
+            image = self.decode_image(path, size)
+        self.images[key] = image
+        return image
+    
+    def decode_image(self, path, size=None):
+        if path in self.missing:
+            raise pygame.error(self.missing[path])
+        try:
+            image = asset_cache.load_image(path, size)
+        except (pygame.error, FileNotFoundError) as e:
+            self.missing[path] = str(e)
+            raise
+        self.decode_count += 1
+        return convert(image)
+    
+    def install_image(self, path, image, size=None):
+        """Cache an image decoded elsewhere (e.g. on the preloader thread)"""
+        key = (path, size, False)
+        if key not in self.images:
+            self.images[key] = convert(image)
+            self.decode_count += 1
+    
+    def install_sound(self, path, sound):
+        self.sounds.setdefault(path, sound)
+    
+    def install_missing(self, path, error):
+        self.missing[path] = error
+    
+    def load_frames(self, path, frame_width, frame_height):
+        """Return the shared FrameSet sliced from a horizontal sprite sheet"""
+        key = (path, frame_width, frame_height)
+        frame_set = self.frame_sets.get(key)
+        if frame_set is None:
+            sheet = self.load_image(path)
+            frame_set = FrameSet(slice_frames(sheet, frame_width, frame_height), self.atlas)
+            self.frame_sets[key] = frame_set
+            print(f"Loaded {len(frame_set.frames)} frames from {os.path.relpath(path, BASE_DIR)}")
+        return frame_set
+    
+    def load_sound(self, path):
+        sound = self.sounds.get(path)
+        if sound is None:
+            if path in self.missing:
+                raise pygame.error(self.missing[path])
+            sound = self.sounds[path] = pygame.mixer.Sound(path)
+        return sound
+    
+    def get_or_create(self, key, factory):
+        """Return a shared generated asset (e.g. a placeholder), building it on first use"""
+        asset = self.generated.get(key)
+        if asset is None:
+            asset = self.generated[key] = factory()
+        return asset
+    
+    def pack(self, surface):
+        """Copy a surface into the texture atlas and return its atlas subsurface"""
+        return self.atlas.add(surface)
+    
+    def evict(self, path):
+        """Drop every cached image, frame set and sound loaded from path.
+        
+        Atlas space used by evicted frames is only reclaimed by clear().
+        """
+        for key in [key for key in self.images if key[0] == path]:
+            del self.images[key]
+        for key in [key for key in self.frame_sets if key[0] == path]:
+            del self.frame_sets[key]
+        self.sounds.pop(path, None)
+        self.missing.pop(path, None)
+    
+    def clear(self):
+        self.images.clear()
+        self.frame_sets.clear()
+        self.sounds.clear()
+        self.generated.clear()
+        self.missing.clear()
+        self.atlas.clear()
+    
+    def memory_usage(self):
+        """Approximate bytes held by the cache, per category"""
+        usage = {
+            'images': sum(surface_bytes(image) for image in self.images.values()),
+            'atlas': self.atlas.memory_usage(),
+            'frames': sum(frame_set.memory_usage() for frame_set in self.frame_sets.values()),
+            'sounds': sum(sound_bytes(sound) for sound in self.sounds.values()),
+            'generated': sum(
+                asset.memory_usage() if isinstance(asset, FrameSet) else surface_bytes(asset)
+                for asset in self.generated.values()
+                if isinstance(asset, (FrameSet, pygame.Surface))
+            )
+        }
+        usage['total'] = sum(usage.values())
+        return usage
+    
+    def stats(self):
+        return {
+            'images': len(self.images),
+            'frame_sets': len(self.frame_sets),
+            'sounds': len(self.sounds),
+            'generated': len(self.generated),
+            'decodes': self.decode_count,
+            'atlas': self.atlas.stats(),
+            'disk_cache': {'hits': asset_cache.hits, 'misses': asset_cache.misses},
+            'bytes': self.memory_usage()
+        }
+
+def convert(image):
+    # convert_alpha needs a display mode; headless tools may not have one
+    if pygame.display.get_surface() is not None:
+        return image.convert_alpha()
+    return image
+
+def slice_frames(sheet, frame_width, frame_height):
+    """Cut a horizontal strip sprite sheet into separate frame surfaces"""
+    frames = []
+    num_frames = max(1, sheet.get_width() // frame_width)
+    for i in range(num_frames):
+        frame = pygame.Surface((frame_width, frame_height), pygame.SRCALPHA)
+        frame.blit(sheet, (0, 0), (i * frame_width, 0, frame_width, frame_height))
+        frames.append(frame)
+    return frames
+
+def surface_bytes(surface):
+    if surface.get_parent() is not None:
+        return 0  # Subsurfaces share their parent's pixels (e.g. atlas pages)
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+def mask_bytes(mask):
+    width, height = mask.get_size()
+    return (width * height + 7) // 8
+
+def sound_bytes(sound):
+    mixer = pygame.mixer.get_init()
+    if not mixer:
+        return 0
+    frequency, size, channels = mixer
+    return int(sound.get_length() * frequency * channels * abs(size) // 8)
+
+# Shared by every entity in the process
+assets = AssetManager()
@@ -0,0 +1,85 @@
+import pygame
+from config import *
+
+class AtlasPage:
+    """One large surface filled left to right in shelves of similar height"""
+    def __init__(self, size):
+        self.size = size
+        self.surface = pygame.Surface((size, size), pygame.SRCALPHA)
+        if pygame.display.get_surface() is not None:
+            self.surface = self.surface.convert_alpha()
+        self.surface.fill((0, 0, 0, 0))
+        self.shelves = []  # [y, height, next_x]
+        self.next_y = 0
+    
+    def allocate(self, width, height, padding):
+        """Reserve a width x height slot, returning its top-left or None if full"""
+        padded_width = width + padding
+        padded_height = height + padding
+        for shelf in self.shelves:
+            y, shelf_height, x = shelf
+            if height <= shelf_height and x + padded_width <= self.size:
+                shelf[2] = x + padded_width
+                return x, y
+        
+        if self.next_y + padded_height > self.size or padded_width > self.size:
+            return None
+        y = self.next_y
+        self.shelves.append([y, padded_height, padded_width])
+        self.next_y += padded_height
+        return 0, y
+
+class TextureAtlas:
+    """Packs small sprite surfaces into a few large pages.
+    
+    add() copies a surface into a page and returns a subsurface of that page,
+    which can be used anywhere a Surface is expected. Renderers that want to
+    batch draws can resolve it back to (page, source rect) with source().
+    """
+    def __init__(self, page_size=ATLAS_PAGE_SIZE, padding=ATLAS_PADDING):
+        self.page_size = page_size
+        self.padding = padding
+        self.pages = []
+        self.packed = 0
+    
+    def add(self, surface):
+        width, height = surface.get_size()
+        if width + self.padding > self.page_size or height + self.padding > self.page_size:
+            return surface  # Too big to share a page with its padding; keep it standalone
+        
+        position = None
+        for page in self.pages:
+            position = page.allocate(width, height, self.padding)
+            if position is not None:
+                break
+        if position is None:
+            page = AtlasPage(self.page_size)
+            self.pages.append(page)
+            position = page.allocate(width, height, self.padding)
+        
+        # Copy pixels (alpha included) instead of blending onto the page
+        page.surface.blit(surface, position, special_flags=pygame.BLEND_RGBA_MAX)
+        self.packed += 1
+        return page.surface.subsurface((position, (width, height)))
+    
+    def clear(self):
+        self.pages.clear()
+        self.packed = 0
+    
+    def memory_usage(self):
+        return sum(page.size * page.size * page.surface.get_bytesize() for page in self.pages)
+    
+    def stats(self):
+        used = sum(page.next_y for page in self.pages)
+        return {
+            'pages': len(self.pages),
+            'frames': self.packed,
+            'fill': used / (len(self.pages) * self.page_size) if self.pages else 0.0
+        }
+
+def source(surface):
+    """Resolve a (possibly atlas) surface to the page it lives on and its area there"""
+    parent = surface.get_abs_parent()
+    if parent is surface:
+        return surface, None
+    return parent, pygame.Rect(surface.get_abs_offset(), surface.get_size())
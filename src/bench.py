@@ -0,0 +1,160 @@
+"""Headless scenario benchmark for the game simulation.
+
+Usage:
+    python -m src.bench --scenario swarm-1000 --ticks 5000
+"""
+import argparse
+import contextlib
+import json
+import math
+import os
+import random
+import sys
+import time
+import numpy as np
+
+# Keep pygame's import banner off stdout so the report stays valid JSON
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+from config import *
+from .game import Game
+from .profiler import Profiler
+from .enemy import Enemy
+from .npc import NPC
+from .terrain import TerrainObstacle
+
+# Entity counts spawned around the player for each named scenario
+SCENARIOS = {
+    'baseline': {'enemies': 5, 'npcs': 3, 'obstacles': 20, 'particles': 0},
+    'swarm-100': {'enemies': 100, 'npcs': 10, 'obstacles': 50, 'particles': 200},
+    'swarm-1000': {'enemies': 1000, 'npcs': 20, 'obstacles': 200, 'particles': 1000},
+    'swarm-5000': {'enemies': 5000, 'npcs': 50, 'obstacles': 500, 'particles': 2000},
+    'obstacles-2000': {'enemies': 200, 'npcs': 3, 'obstacles': 2000, 'particles': 0},
+    'particles-20k': {'enemies': 5, 'npcs': 3, 'obstacles': 20, 'particles': 20000},
+    # 10k enemies packed inside the LOD near radius, all fully simulated
+    'horde-10k': {'enemies': 10000, 'npcs': 20, 'obstacles': 50, 'particles': 1000, 'enemy_radius': 550},
+}
+
+NPC_TYPES = ['merchant', 'healer', 'quest_giver']
+
+def spawn_radius(count):
+    """Spread entities so density stays roughly constant as counts grow"""
+    return max(400, int(40 * math.sqrt(count)))
+
+def random_position(center, radius):
+    return (
+        center[0] + random.randint(-radius, radius),
+        center[1] + random.randint(-radius, radius)
+    )
+
+def populate(game, counts):
+    """Replace the default world contents with the scenario's entity counts"""
+    center = game.player.rect.center
+    
+    game.enemies.empty()
+    radius = counts.get('enemy_radius') or spawn_radius(counts['enemies'])
+    for _ in range(counts['enemies']):
+        x, y = random_position(center, radius)
+        game.enemies.add(Enemy(x, y, random.choice(['enemy1', 'enemy2'])))
+    
+    game.npcs.empty()
+    radius = spawn_radius(counts['npcs'])
+    for i in range(counts['npcs']):
+        x, y = random_position(center, radius)
+        game.npcs.add(NPC(x, y, NPC_TYPES[i % len(NPC_TYPES)]))
+    
+    game.obstacles.empty()
+    radius = spawn_radius(counts['obstacles'])
+    for _ in range(counts['obstacles']):
+        x, y = random_position(center, radius)
+        obstacle = TerrainObstacle(x, y, random.randint(50, 150), random.randint(50, 150))
+        game.obstacles.add(obstacle)
+    
+    # Stress scenarios measure raw throughput: size the pool for the target, no culling
+    if counts['particles'] > PARTICLE_BUDGET * PARTICLE_SOFT_LIMIT * PARTICLE_PRIORITIES['hit']:
+        # Resize the game's own pool: game.effects updates and draws that one
+        game.particles.set_budget(counts['particles'] * 2)
+        game.particles.camera = None
+    
+    # Keep the player alive so the whole run stays in the 'playing' state
+    game.player.max_health = game.player.health = 10 ** 9
+
+def top_up_particles(game, target):
+    """Emit hit bursts until the live particle count reaches the target"""
+    if len(game.particles) >= target:
+        return
+    radius = spawn_radius(target // 10)
+    center = game.player.rect.center
+    while len(game.particles) < target:
+        x, y = random_position(center, radius)
+        if not game.particles.create_hit_effect(x, y):
+            break  # Budget exhausted
+
+def run_scenario(name, ticks, seed, warmup, overrides):
+    counts = dict(SCENARIOS[name])
+    counts.update({key: value for key, value in overrides.items() if value is not None})
+    
+    # Asset loading chatter goes to stderr so stdout stays valid JSON
+    with contextlib.redirect_stdout(sys.stderr):
+        game = Game(headless=True, seed=seed)
+        game.setup_game()
+        game.state = 'playing'
+        populate(game, counts)
+    
+    def before_tick(game, tick):
+        top_up_particles(game, counts['particles'])
+    
+    with contextlib.redirect_stdout(sys.stderr):
+        game.run_headless(warmup, before_tick)
+        game.profiler = Profiler(capacity=ticks, enabled=True)
+        start = time.perf_counter()
+        game.run_headless(ticks, before_tick)
+        wall_time = time.perf_counter() - start
+    
+    # Near enemies as they stand now; last tick's indices may point past kills' swap-removes
+    store = game.enemies.store
+    near = game.lod.near_of(np.column_stack(store.centers()), game.camera.world_center())
+    
+    return {
+        'scenario': name,
+        'ticks': ticks,
+        'warmup_ticks': warmup,
+        'seed': seed,
+        'counts': counts,
+        'wall_time_s': wall_time,
+        'phases': game.profiler.summary(),
+        # The scheduler only thinks for near enemies; mid and far ones are simulated by the LOD
+        'ai': game.ai_scheduler.stats([store.views[i] for i in near.tolist()]),
+        'lod': game.lod.stats(),
+        'pathfinding': game.flow_field.stats()
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a headless simulation benchmark")
+    parser.add_argument('--scenario', default='baseline', choices=sorted(SCENARIOS))
+    parser.add_argument('--ticks', type=int, default=1000)
+    parser.add_argument('--warmup', type=int, default=60, help="Untimed ticks run before measuring")
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--enemies', type=int, help="Override the scenario's enemy count")
+    parser.add_argument('--npcs', type=int, help="Override the scenario's NPC count")
+    parser.add_argument('--obstacles', type=int, help="Override the scenario's obstacle count")
+    parser.add_argument('--particles', type=int, help="Override the scenario's particle count")
+    parser.add_argument('--output', help="Also write the JSON report to this file")
+    args = parser.parse_args(argv)
+    
+    overrides = {
+        'enemies': args.enemies,
+        'npcs': args.npcs,
+        'obstacles': args.obstacles,
+        'particles': args.particles
+    }
+    report = run_scenario(args.scenario, args.ticks, args.seed, args.warmup, overrides)
+    
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,5 @@
 import pygame
+import numpy as np
 from config import *
 
 class Camera:
@@ -11,21 +12,58 @@ class Camera:
         self.smoothing = 0.1
         self.target_x = 0
         self.target_y = 0
+        
+        # Interpolation between the last two simulation ticks
+        self.previous_x = 0
+        self.previous_y = 0
+        self.offset = (0, 0)
     
     def apply(self, entity):
         """Returns entity's rect relative to camera"""
-        return entity.rect.move(self.camera.topleft)
+        return entity.rect.move(self.offset)
     
     def apply_rect(self, rect):
         """Returns rect relative to camera"""
-        return rect.move(self.camera.topleft)
+        return rect.move(self.offset)
+    
+    def apply_interpolated(self, entity, alpha):
+        """Returns entity's rect relative to camera, blended between its last two tick positions"""
+        x, y = entity.rect.topleft
+        prev_x, prev_y = getattr(entity, 'previous_position', (x, y))
+        return pygame.Rect(
+            round(prev_x + (x - prev_x) * alpha) + self.offset[0],
+            round(prev_y + (y - prev_y) * alpha) + self.offset[1],
+            entity.rect.width,
+            entity.rect.height
+        )
+    
+    def interpolated_positions(self, x, y, previous_x, previous_y, alpha):
+        """apply_interpolated() for arrays of top-left positions, returning screen x and y arrays"""
+        return (
+            np.round(previous_x + (x - previous_x) * alpha).astype(np.int64) + self.offset[0],
+            np.round(previous_y + (y - previous_y) * alpha).astype(np.int64) + self.offset[1]
+        )
+    
+    def world_center(self):
+        """World position at the middle of the view, as of the last tick"""
+        return (self.width // 2 - self.camera.x, self.height // 2 - self.camera.y)
+    
+    def interpolate(self, alpha):
+        """Set the render offset between the previous and current tick positions"""
+        self.offset = (
+            round(self.previous_x + (self.camera.x - self.previous_x) * alpha),
+            round(self.previous_y + (self.camera.y - self.previous_y) * alpha)
+        )
     
     def update(self, target):
         """Update camera position to follow target"""
+        self.previous_x, self.previous_y = self.camera.topleft
+        
         # Calculate target position (center on target)
         self.target_x = -target.rect.centerx + SCREEN_WIDTH // 2
         self.target_y = -target.rect.centery + SCREEN_HEIGHT // 2
         
         # Smooth camera movement
         self.camera.x += (self.target_x - self.camera.x) * self.smoothing
-        self.camera.y += (self.target_y - self.camera.y) * self.smoothing 
\ No newline at end of file
+        self.camera.y += (self.target_y - self.camera.y) * self.smoothing
+        self.offset = self.camera.topleft
@@ -0,0 +1,86 @@
+import os
+import time
+import pygame
+from config import *
+
+class ProfilerOverlay:
+    """Frame-time graph and per-phase timing table drawn over the game (F3)"""
+    def __init__(self, profiler):
+        self.profiler = profiler
+        self.visible = False
+        self.font = pygame.font.Font(None, 18)
+        
+        self.width = 300
+        self.graph_height = 60
+        self.line_height = 14
+        self.position = (SCREEN_WIDTH - self.width - 10, 60)
+        self.budget_ms = TICK_MS
+        
+        # The panel is redrawn a few times per second and blitted every frame
+        self.panel = None
+        self.last_refresh = 0
+    
+    def toggle(self):
+        self.visible = not self.visible
+        self.panel = None
+    
+    def draw(self, screen):
+        if not self.visible:
+            return
+        now = pygame.time.get_ticks()
+        if self.panel is None or now - self.last_refresh >= PROFILER_OVERLAY_REFRESH_MS:
+            self.panel = self.build_panel()
+            self.last_refresh = now
+        screen.blit(self.panel, self.position)
+    
+    def build_panel(self):
+        summary = self.profiler.summary()
+        phases = [name for name in summary if name != 'frame']
+        height = self.graph_height + 30 + self.line_height * (len(phases) + 2)
+        
+        panel = pygame.Surface((self.width, height), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 180))
+        self.draw_graph(panel)
+        
+        y = self.graph_height + 10
+        frame = summary['frame']
+        self.draw_text(panel, (5, y),
+                       f"frame p50 {frame['p50_ms']:.1f}  p95 {frame['p95_ms']:.1f}  "
+                       f"p99 {frame['p99_ms']:.1f} ms  hitches {self.profiler.hitches}")
+        y += self.line_height + 4
+        self.draw_text(panel, (5, y), "phase", (180, 180, 180))
+        for i, label in enumerate(("mean", "p95", "p99")):
+            self.draw_text(panel, (150 + i * 50, y), label, (180, 180, 180))
+        
+        for name in phases:
+            y += self.line_height
+            stats = summary[name]
+            self.draw_text(panel, (5, y), name)
+            for i, key in enumerate(('mean_ms', 'p95_ms', 'p99_ms')):
+                self.draw_text(panel, (150 + i * 50, y), f"{stats[key]:.2f}")
+        return panel
+    
+    def draw_graph(self, panel):
+        """One bar per recorded frame, scaled so twice the tick budget fills the graph"""
+        frames = self.profiler.frame_history()[-(self.width - 10):]
+        scale = self.graph_height / (self.budget_ms * 2)
+        bottom = self.graph_height + 5
+        for i, frame_ms in enumerate(frames):
+            bar = min(self.graph_height, int(frame_ms * scale))
+            color = (255, 80, 80) if frame_ms > self.profiler.hitch_ms else (80, 220, 80)
+            pygame.draw.line(panel, color, (5 + i, bottom), (5 + i, bottom - bar))
+        
+        # Tick budget reference line
+        budget_y = bottom - int(self.budget_ms * scale)
+        pygame.draw.line(panel, (255, 255, 0), (5, budget_y), (self.width - 5, budget_y))
+    
+    def draw_text(self, panel, position, text, color=WHITE):
+        panel.blit(self.font.render(text, True, color), position)
+    
+    def dump(self):
+        """Write the profiler ring buffer to timestamped JSON and CSV files"""
+        os.makedirs(PROFILES_DIR, exist_ok=True)
+        stem = os.path.join(PROFILES_DIR, time.strftime("profile_%Y%m%d_%H%M%S"))
+        self.profiler.dump_json(stem + '.json')
+        self.profiler.dump_csv(stem + '.csv')
+        return stem
@@ -1,40 +1,91 @@
 import pygame
-import random
 from config import *
 import os
+from .assets import assets
+from .text import text_renderer
 
-class ParticleEffect:
-    def __init__(self, x, y, color, particle_count=10, lifetime=30):
-        self.particles = []
-        self.lifetime = lifetime
-        
-        for _ in range(particle_count):
-            particle = {
-                'pos': [x, y],
-                'vel': [random.uniform(-2, 2), random.uniform(-2, 2)],
-                'timer': lifetime,
-                'color': color,
-                'size': random.randint(2, 4)
-            }
-            self.particles.append(particle)
+class FloatingText:
+    """A pooled text label that rises and fades out"""
+    def __init__(self):
+        self.active = False
+        self.surface = None
+        self.x = 0.0
+        self.y = 0.0
+        self.lifetime = 0
+        self.max_lifetime = 1
+        self.screen_space = False
+    
+    def spawn(self, text, position, color, lifetime, screen_space):
+        # Own copy of the cached text surface, so fading it doesn't touch the cache
+        self.surface = text_renderer.render(text, EFFECT_TEXT_SIZE, color).copy()
+        self.x, self.y = position
+        self.lifetime = self.max_lifetime = lifetime
+        self.screen_space = screen_space
+        self.active = True
+
+class EffectSystem:
+    """Owns every transient visual effect: hit sparks, death bursts and floating text.
+    
+    Sparks and bursts are emitted into the (pooled, budgeted) particle system;
+    floating text comes from a fixed pool of EFFECT_TEXT_POOL slots, and the
+    oldest label is recycled when the pool is full. One update() per tick and
+    one draw() per frame cover all of them.
+    """
+    def __init__(self, particles, text_pool=EFFECT_TEXT_POOL):
+        self.particles = particles
+        self.texts = [FloatingText() for _ in range(text_pool)]
+    
+    def hit_sparks(self, position, color=(255, 255, 255)):
+        return self.particles.create_hit_effect(position[0], position[1], color)
+    
+    def death_burst(self, position, color=(255, 0, 0)):
+        return self.particles.create_death_effect(position[0], position[1], color)
+    
+    def floating_text(self, text, position, color=WHITE, lifetime=EFFECT_TEXT_LIFETIME, screen_space=False):
+        """Show text at a world position (or a screen position with screen_space=True)"""
+        slot = None
+        for label in self.texts:
+            if not label.active:
+                slot = label
+                break
+            if slot is None or label.lifetime < slot.lifetime:
+                slot = label  # Fall back to the label closest to expiring
+        slot.spawn(text, position, color, lifetime, screen_space)
+        return slot
+    
+    def active_texts(self):
+        return sum(1 for label in self.texts if label.active)
     
     def update(self):
-        for particle in self.particles[:]:
-            particle['pos'][0] += particle['vel'][0]
-            particle['pos'][1] += particle['vel'][1]
-            particle['timer'] -= 1
-            
-            if particle['timer'] <= 0:
-                self.particles.remove(particle)
+        self.particles.update()
+        for label in self.texts:
+            if label.active:
+                label.y -= EFFECT_TEXT_RISE
+                label.lifetime -= 1
+                if label.lifetime <= 0:
+                    label.active = False
+                    label.surface = None
+    
+    def draw(self, screen, camera):
+        self.particles.draw(screen, camera)
+        
+        batch = []
+        offset_x, offset_y = camera.offset
+        for label in self.texts:
+            if label.active:
+                label.surface.set_alpha(int(255 * label.lifetime / label.max_lifetime))
+                x, y = label.x, label.y
+                if not label.screen_space:
+                    x += offset_x
+                    y += offset_y
+                batch.append((label.surface, label.surface.get_rect(center=(int(x), int(y)))))
+        if batch:
+            screen.blits(batch, doreturn=False)
     
-    def draw(self, surface):
-        for particle in self.particles:
-            pygame.draw.circle(
-                surface,
-                particle['color'],
-                (int(particle['pos'][0]), int(particle['pos'][1])),
-                particle['size']
-            )
+    def clear(self):
+        for label in self.texts:
+            label.active = False
+            label.surface = None
 
 class AnimationManager:
     def __init__(self):
@@ -60,16 +111,7 @@ class AnimationManager:
     
     def load_spritesheet(self, path, frame_width, frame_height, frames):
         try:
-            spritesheet = pygame.image.load(path).convert_alpha()
-            animation_frames = []
-            
-            for i in range(frames):
-                frame = pygame.Surface((frame_width, frame_height), pygame.SRCALPHA)
-                frame.blit(spritesheet, (0, 0), 
-                          (i * frame_width, 0, frame_width, frame_height))
-                animation_frames.append(frame)
-                
-            return animation_frames
+            return assets.load_frames(path, frame_width, frame_height).frames[:frames]
         except pygame.error as e:
             print(f"Warning: Could not load spritesheet at {path}: {e}")
             return None 
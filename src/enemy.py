@@ -2,111 +2,152 @@ import pygame
 import math
 import random
 from config import *
-from .enemy_animation import EnemyAnimation
+from .entity_store import EnemyRow, enemy_types, ENEMY_STATES, STATE_CODES, IDLE, WALK, ATTACK
+
+def stored(name, cast):
+    """Property that reads (as cast) and writes one field of the enemy's store row"""
+    def get(self):
+        return cast(getattr(self.store, name)[self.index])
+    def set(self, value):
+        getattr(self.store, name)[self.index] = value
+    return property(get, set)
+
+def synced(name):
+    """In-place Rect method that writes the result back to the store row"""
+    method = getattr(pygame.Rect, name)
+    def call(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        if self.view is not None:
+            self.view.rect = self
+        return result
+    return call
+
+class StoreRect(pygame.Rect):
+    """Rect returned by Enemy.rect that writes changes back to the enemy's row.
+    
+    Attribute assignment and the in-place methods update the store, so
+    `enemy.rect.x += 5` moves the enemy as on any sprite. Rects derived
+    from it (move(), copy(), clip() and so on) are detached copies.
+    """
+    view = None
+    
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if self.view is not None:
+            self.view.rect = self
+    
+    move_ip = synced('move_ip')
+    inflate_ip = synced('inflate_ip')
+    scale_by_ip = synced('scale_by_ip')
+    update = synced('update')
+    clamp_ip = synced('clamp_ip')
+    union_ip = synced('union_ip')
+    unionall_ip = synced('unionall_ip')
+    normalize = synced('normalize')
 
 class Enemy(pygame.sprite.Sprite):
+    """One enemy, as a view onto a row of an EnemyStore or an EnemyRow.
+    
+    A new enemy gets a detached EnemyRow; adding it to the game's
+    EnemyGroup moves the row into the group's shared store. Attributes read
+    and write the row, and `image` and `mask` are looked up from it on
+    access. `rect` is a StoreRect, so changes to it reach the row too; code
+    that runs over many enemies should read the store arrays instead.
+    """
+    speed = stored('speed', float)
+    velocity_x = stored('velocity_x', float)
+    velocity_y = stored('velocity_y', float)
+    health = stored('health', int)
+    max_health = stored('max_health', int)
+    damage = stored('damage', int)
+    attack_cooldown = stored('attack_cooldown', int)
+    attack_range = stored('attack_range', float)
+    detection_range = stored('detection_range', float)
+    facing_right = stored('facing_right', bool)
+    
     def __init__(self, x, y, enemy_type="enemy1"):
         super().__init__()
         self.enemy_type = enemy_type
-        self.animation = EnemyAnimation(enemy_type)
-        self.image = self.animation.get_current_frame()
-        self.rect = self.image.get_rect()
-        self.rect.x = x
-        self.rect.y = y
-        self.mask = pygame.mask.from_surface(self.image)
-        
-        # Movement
-        self.speed = ENEMY_SPEED
-        self.velocity_x = 0
-        self.velocity_y = 0
-        self.last_update = pygame.time.get_ticks()
-        
-        # Combat
-        self.health = 100
-        self.max_health = 100
-        self.damage = 10
-        self.attack_cooldown = 0
-        self.attack_range = 100
-        self.detection_range = 300
-        
-        # AI
-        self.state = 'idle'
-        self.target = None
-        self.path = []
-        self.path_update_timer = 0
-        self.path_update_delay = 1000  # Update path every second
-    
-    def update(self, player, terrain_manager, obstacles):
-        current_time = pygame.time.get_ticks()
-        dt = current_time - self.last_update
-        self.last_update = current_time
-        
-        # Update attack cooldown
-        if self.attack_cooldown > 0:
-            self.attack_cooldown -= 1
-        
-        # Calculate distance to player
-        dx = player.rect.centerx - self.rect.centerx
-        dy = player.rect.centery - self.rect.centery
-        distance = math.sqrt(dx * dx + dy * dy)
-        
-        # Update state based on distance
-        if distance <= self.attack_range:
-            self.state = 'attack'
-        elif distance <= self.detection_range:
-            self.state = 'walk'
-        else:
-            self.state = 'idle'
-        
-        # Update facing direction
-        self.animation.facing_right = dx > 0
-        
-        # Handle movement based on state
-        if self.state == 'walk':
-            # Move towards player
-            angle = math.atan2(dy, dx)
-            self.velocity_x = math.cos(angle) * self.speed
-            self.velocity_y = math.sin(angle) * self.speed
-        else:
-            self.velocity_x = 0
-            self.velocity_y = 0
         
-        # Apply terrain movement penalty
-        current_terrain = terrain_manager.get_terrain_at_position(
-            self.rect.centerx, 
-            self.rect.centery
-        )
-        terrain_penalty = TERRAIN_MOVEMENT_PENALTIES.get(current_terrain, 1.0)
-        self.velocity_x *= terrain_penalty
-        self.velocity_y *= terrain_penalty
+        # Frames are shared by every enemy of the type; per-enemy animation state lives in the store
+        self.store = EnemyRow()
+        self.index = self.store.allocate(self)
+        self.store.type_code[self.index] = enemy_types.code(enemy_type)
+        self.animation = enemy_types.animations[self.store.type_code[self.index]]
         
-        # Move X
-        self.rect.x += self.velocity_x
-        self.handle_collision(obstacles, 'x')
-        
-        # Move Y
-        self.rect.y += self.velocity_y
-        self.handle_collision(obstacles, 'y')
-        
-        # Update animation
-        self.animation.update(dt, self.state, self.state == 'walk')
-        self.image = self.animation.get_current_frame()
-    
-    def handle_collision(self, obstacles, direction):
-        for obstacle in obstacles:
-            if pygame.sprite.collide_mask(self, obstacle):
-                if direction == 'x':
-                    if self.velocity_x > 0:  # Moving right
-                        self.rect.right = obstacle.rect.left
-                    else:  # Moving left
-                        self.rect.left = obstacle.rect.right
-                else:  # direction == 'y'
-                    if self.velocity_y > 0:  # Moving down
-                        self.rect.bottom = obstacle.rect.top
-                    else:  # Moving up
-                        self.rect.top = obstacle.rect.bottom
+        self.rect = self.image.get_rect(topleft=(x, y))
+        self.previous_position = self.rect.topleft
+    
+    @property
+    def rect(self):
+        store, index = self.store, self.index
+        rect = StoreRect(store.x[index], store.y[index], store.width[index], store.height[index])
+        object.__setattr__(rect, 'view', self)
+        return rect
+    
+    def bounds(self):
+        """A detached copy of rect, for scratch work that shouldn't touch the row"""
+        store, index = self.store, self.index
+        return pygame.Rect(store.x[index], store.y[index], store.width[index], store.height[index])
+    
+    @rect.setter
+    def rect(self, rect):
+        store, index = self.store, self.index
+        store.x[index], store.y[index], store.width[index], store.height[index] = rect
+    
+    @property
+    def previous_position(self):
+        return (int(self.store.previous_x[self.index]), int(self.store.previous_y[self.index]))
+    
+    @previous_position.setter
+    def previous_position(self, position):
+        self.store.previous_x[self.index], self.store.previous_y[self.index] = position
+    
+    @property
+    def heading(self):
+        """Unit direction to the target as of the last think"""
+        return (float(self.store.heading_x[self.index]), float(self.store.heading_y[self.index]))
+    
+    @heading.setter
+    def heading(self, heading):
+        self.store.heading_x[self.index], self.store.heading_y[self.index] = heading
+    
+    @property
+    def state(self):
+        return ENEMY_STATES[self.store.state[self.index]]
+    
+    @state.setter
+    def state(self, state):
+        self.store.state[self.index] = STATE_CODES[state]
+    
+    @property
+    def thought_at(self):
+        """Scheduler tick of the last think, or None"""
+        tick = int(self.store.thought_at[self.index])
+        return tick if tick >= 0 else None
+    
+    @thought_at.setter
+    def thought_at(self, tick):
+        self.store.thought_at[self.index] = -1 if tick is None else tick
+    
+    def frame_list(self, frames, flipped):
+        store, index = self.store, self.index
+        animations = frames if store.frame_facing_right[index] else flipped
+        return animations[ENEMY_STATES[store.anim_state[index]]], store.anim_frame[index]
+    
+    @property
+    def image(self):
+        # Left-facing frames were flipped at load time
+        frames, frame = self.frame_list(self.animation.animations, self.animation.flipped_animations)
+        return frames[min(frame, len(frames) - 1)]
+    
+    @property
+    def mask(self):
+        """The precomputed mask matching image"""
+        masks, frame = self.frame_list(self.animation.masks, self.animation.flipped_masks)
+        return masks[min(frame, len(masks) - 1)]
     
     def take_damage(self, amount):
         """Take damage and return True if enemy dies"""
         self.health -= amount
-        return self.health <= 0 
+        return self.health <= 0
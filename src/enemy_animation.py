@@ -1,6 +1,7 @@
 import pygame
 import os
 from config import *
+from .assets import assets, FrameSet
 
 class EnemyAnimation:
     def __init__(self, enemy_type="enemy1", frame_width=93, frame_height=93):
@@ -12,6 +13,10 @@ class EnemyAnimation:
             'walk': [],
             'attack': []
         }
+        # Left-facing frames and collision masks, shared through the asset manager
+        self.flipped_animations = {state: [] for state in self.animations}
+        self.masks = {state: [] for state in self.animations}
+        self.flipped_masks = {state: [] for state in self.animations}
         self.current_state = 'idle'
         self.current_frame = 0
         self.animation_timer = 0
@@ -23,48 +28,46 @@ class EnemyAnimation:
     def load_sprite_sheets(self):
         base_path = os.path.join(ENEMY_ASSETS_DIR, self.enemy_type)
         
-        # Load animations for each state
+        # Frame sets are shared by every enemy of this type
         for state in self.animations.keys():
             try:
-                sprite_sheet = pygame.image.load(
-                    os.path.join(base_path, f"{state}.png")
-                ).convert_alpha()
-                self.animations[state] = self.extract_frames(sprite_sheet)
-                print(f"Loaded {len(self.animations[state])} frames for {self.enemy_type} {state}")
+                frame_set = assets.load_frames(
+                    os.path.join(base_path, f"{state}.png"),
+                    self.frame_width, self.frame_height
+                )
+                self.use_frame_set(state, frame_set)
             except (pygame.error, FileNotFoundError) as e:
                 print(f"Error loading {self.enemy_type} {state} animation: {e}")
                 self.create_placeholder_frames(state)
     
-    def extract_frames(self, sprite_sheet):
-        frames = []
-        sheet_width = sprite_sheet.get_width()
-        num_frames = max(1, sheet_width // self.frame_width)
-        
-        for i in range(num_frames):
-            frame_surface = pygame.Surface((self.frame_width, self.frame_height), pygame.SRCALPHA)
-            frame_surface.blit(sprite_sheet, (0, 0), 
-                             (i * self.frame_width, 0, self.frame_width, self.frame_height))
-            frames.append(frame_surface)
-        
-        return frames
-    
     def create_placeholder_frames(self, state, num_frames=4):
         """Create placeholder frames for missing animations"""
-        frames = []
-        colors = {
-            'idle': (255, 0, 0),     # Red
-            'walk': (0, 255, 0),     # Green
-            'attack': (255, 255, 0)  # Yellow
-        }
-        
-        for _ in range(num_frames):
-            frame = pygame.Surface((self.frame_width, self.frame_height), pygame.SRCALPHA)
-            pygame.draw.rect(frame, colors.get(state, (128, 128, 128)), 
-                           (0, 0, self.frame_width, self.frame_height))
-            frames.append(frame)
+        def build():
+            frames = []
+            colors = {
+                'idle': (255, 0, 0),     # Red
+                'walk': (0, 255, 0),     # Green
+                'attack': (255, 255, 0)  # Yellow
+            }
+            
+            for _ in range(num_frames):
+                frame = pygame.Surface((self.frame_width, self.frame_height), pygame.SRCALPHA)
+                pygame.draw.rect(frame, colors.get(state, (128, 128, 128)), 
+                               (0, 0, self.frame_width, self.frame_height))
+                frames.append(frame)
+            
+            print(f"Created {num_frames} placeholder frames for {self.enemy_type} {state}")
+            return FrameSet(frames, assets.atlas)
         
-        self.animations[state] = frames
-        print(f"Created {num_frames} placeholder frames for {self.enemy_type} {state}")
+        key = ('enemy_placeholder', self.enemy_type, state, self.frame_width, self.frame_height)
+        self.use_frame_set(state, assets.get_or_create(key, build))
+    
+    def use_frame_set(self, state, frame_set):
+        """Point a state at shared frames, flipped frames and masks baked at load time"""
+        self.animations[state] = frame_set.frames
+        self.flipped_animations[state] = frame_set.flipped
+        self.masks[state] = frame_set.masks
+        self.flipped_masks[state] = frame_set.flipped_masks
     
     def update(self, dt, state=None, moving=False):
         if state and state in self.animations:
@@ -78,17 +81,18 @@ class EnemyAnimation:
                 self.current_frame = (self.current_frame + 1) % num_frames
     
     def get_current_frame(self):
-        frames = self.animations[self.current_state]
-        if not frames:
+        if not self.animations[self.current_state]:
             self.create_placeholder_frames(self.current_state)
-            frames = self.animations[self.current_state]
+        
+        # Left-facing frames were flipped at load time
+        animations = self.animations if self.facing_right else self.flipped_animations
+        frames = animations[self.current_state]
         
         # Ensure current_frame is within bounds
         self.current_frame = min(self.current_frame, len(frames) - 1)
-        frame = frames[self.current_frame]
-        
-        # Flip the frame if facing left
-        if not self.facing_right:
-            frame = pygame.transform.flip(frame, True, False)
-        
-        return frame 
\ No newline at end of file
+        return frames[self.current_frame]
+    
+    def get_current_mask(self):
+        """Return the precomputed mask matching get_current_frame()"""
+        masks = (self.masks if self.facing_right else self.flipped_masks)[self.current_state]
+        return masks[min(self.current_frame, len(masks) - 1)]
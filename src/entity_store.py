@@ -0,0 +1,355 @@
+import numpy as np
+import pygame
+from config import *
+from .assets import assets
+from .atlas import source as atlas_source
+from .enemy_animation import EnemyAnimation
+
+# AI and animation states, stored as uint8 codes
+ENEMY_STATES = ['idle', 'walk', 'attack']
+STATE_CODES = {state: code for code, state in enumerate(ENEMY_STATES)}
+IDLE, WALK, ATTACK = range(len(ENEMY_STATES))
+
+def round_half_away(values):
+    """Round like assigning floats to a pygame Rect: halves go away from zero"""
+    whole = np.trunc(values)
+    return (whole + np.sign(values) * (np.abs(values - whole) >= 0.5)).astype(np.int64)
+
+def push_out(rect, mask, obstacles, direction, moving_forward):
+    """Push rect back out of the obstacles it overlaps along one axis; with a mask, only ones the mask touches count"""
+    for obstacle in obstacles.query(rect):
+        if mask is None or mask.overlap(obstacle.mask, (obstacle.rect.x - rect.x, obstacle.rect.y - rect.y)):
+            if direction == 'x':
+                if moving_forward:  # Moving right
+                    rect.right = obstacle.rect.left
+                else:  # Moving left
+                    rect.left = obstacle.rect.right
+            else:  # direction == 'y'
+                if moving_forward:  # Moving down
+                    rect.bottom = obstacle.rect.top
+                else:  # Moving up
+                    rect.top = obstacle.rect.bottom
+
+class EnemyTypeRegistry:
+    """uint8 codes for enemy types, each with one EnemyAnimation whose frames every enemy of the type shares"""
+    def __init__(self):
+        self.codes = {}
+        self.names = []
+        self.animations = []
+        self.frame_counts = np.zeros((0, len(ENEMY_STATES)), dtype=np.int64)  # [type, state] -> frames
+        self.frame_delays = np.zeros(0)  # [type] -> ms per animation frame
+        self.sources = []  # (atlas page, area) of every frame, flipped and not
+        self.source_starts = np.zeros((0, 2, len(ENEMY_STATES)), dtype=np.int64)  # [type, facing right, state] -> first source
+    
+    def code(self, enemy_type):
+        code = self.codes.get(enemy_type)
+        if code is None:
+            animation = assets.get_or_create(('enemy_animation', enemy_type), lambda: EnemyAnimation(enemy_type))
+            code = self.codes[enemy_type] = len(self.names)
+            self.names.append(enemy_type)
+            self.animations.append(animation)
+            counts = [[max(1, len(animation.animations[state])) for state in ENEMY_STATES]]
+            self.frame_counts = np.concatenate((self.frame_counts, np.array(counts, dtype=np.int64)))
+            self.frame_delays = np.append(self.frame_delays, animation.animation_delay)
+            starts = []
+            for frames in (animation.flipped_animations, animation.animations):
+                starts.append([])
+                for state in ENEMY_STATES:
+                    starts[-1].append(len(self.sources))
+                    self.sources.extend(atlas_source(frame) for frame in frames[state])
+            self.source_starts = np.concatenate((self.source_starts, np.array([starts], dtype=np.int64)))
+        return code
+    
+    def frame_sources(self, store, indices):
+        """(atlas page, area) of the frame each row's image shows, for batched blits"""
+        type_code, state = store.type_code[indices], store.anim_state[indices]
+        frame = np.minimum(store.anim_frame[indices], self.frame_counts[type_code, state] - 1)
+        first = self.source_starts[type_code, store.frame_facing_right[indices].astype(np.int64), state]
+        sources = self.sources
+        return [sources[i] for i in (first + frame).tolist()]
+
+enemy_types = EnemyTypeRegistry()
+
+class EnemyStore:
+    """Enemy state in contiguous NumPy arrays, one row per enemy.
+    
+    Enemy objects are thin views onto a row (store, index). Rows are
+    removed by swapping the last row into the hole, and the moved view's
+    index is patched, so live rows always occupy [0, count). Systems that
+    run over many enemies at once (centres for LOD, thinking, steering,
+    animation, damage) are vectorized passes over index arrays.
+    """
+    # (field, dtype, default)
+    FIELDS = [
+        ('type_code', np.uint8, 0),
+        ('x', np.int64, 0), ('y', np.int64, 0),  # Rect top-left
+        ('width', np.int64, 0), ('height', np.int64, 0),
+        ('previous_x', np.int64, 0), ('previous_y', np.int64, 0),
+        ('velocity_x', np.float64, 0.0), ('velocity_y', np.float64, 0.0),
+        ('heading_x', np.float64, 0.0), ('heading_y', np.float64, 0.0),
+        ('speed', np.float64, ENEMY_SPEED),
+        ('health', np.int64, 100), ('max_health', np.int64, 100), ('damage', np.int64, 10),
+        ('attack_cooldown', np.int64, 0), ('attack_range', np.float64, 100), ('detection_range', np.float64, 300),
+        ('state', np.uint8, IDLE), ('facing_right', np.bool_, True),
+        ('anim_state', np.uint8, IDLE), ('anim_frame', np.int64, 0), ('anim_timer', np.float64, 0.0),
+        ('frame_facing_right', np.bool_, True),  # Facing shown by image/mask, as of the last animation pass
+        ('thought_at', np.int64, -1),  # Scheduler tick of the last think, -1 for never
+    ]
+    
+    def __init__(self, capacity=64):
+        self.capacity = max(1, capacity)
+        self.count = 0
+        self.views = []  # Row -> Enemy
+        for name, dtype, _ in self.FIELDS:
+            setattr(self, name, np.zeros(self.capacity, dtype=dtype))
+    
+    def __len__(self):
+        return self.count
+    
+    def grow(self):
+        self.capacity *= 2
+        for name, dtype, _ in self.FIELDS:
+            array = np.zeros(self.capacity, dtype=dtype)
+            array[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, array)
+    
+    def allocate(self, view):
+        """Append a row of defaults for a view and return its index"""
+        if self.count == self.capacity:
+            self.grow()
+        index = self.count
+        for name, _, default in self.FIELDS:
+            getattr(self, name)[index] = default
+        self.views.append(view)
+        self.count += 1
+        return index
+    
+    def release(self, index):
+        """Remove a row, moving the last row into its place"""
+        last = self.count - 1
+        if index != last:
+            for name, _, _ in self.FIELDS:
+                array = getattr(self, name)
+                array[index] = array[last]
+            moved = self.views[last]
+            self.views[index] = moved
+            moved.index = index
+        self.views.pop()
+        self.count -= 1
+    
+    def adopt(self, view):
+        """Move a view's row into this store"""
+        source, source_index = view.store, view.index
+        if self.count == self.capacity:
+            self.grow()
+        index = self.count
+        for name, _, _ in self.FIELDS:
+            getattr(self, name)[index] = getattr(source, name)[source_index]
+        self.views.append(view)
+        self.count += 1
+        source.release(source_index)
+        view.store = self
+        view.index = index
+    
+    def centers(self, indices=None):
+        """Rect centres of the given rows (by default every live row), as (xs, ys)"""
+        if indices is None:
+            indices = slice(0, self.count)
+        return self.x[indices] + self.width[indices] // 2, self.y[indices] + self.height[indices] // 2
+    
+    def animate(self, indices, dt):
+        """Advance animation frames, matching EnemyAnimation.update() followed by get_current_frame()"""
+        if not len(indices):
+            return
+        self.anim_state[indices] = self.state[indices]
+        self.frame_facing_right[indices] = self.facing_right[indices]
+        frame_counts = enemy_types.frame_counts[self.type_code[indices], self.anim_state[indices]]
+        
+        timer = self.anim_timer[indices] + dt
+        frame = self.anim_frame[indices]
+        advance = timer >= enemy_types.frame_delays[self.type_code[indices]]
+        timer[advance] = 0
+        frame[advance] = (frame[advance] + 1) % frame_counts[advance]
+        self.anim_timer[indices] = timer
+        self.anim_frame[indices] = np.minimum(frame, frame_counts - 1)
+    
+    def think(self, indices, target, tick=None):
+        """Vectorized think: each row's distance to target picks its state, facing and heading.
+        
+        Rows on top of the target head along +x, as atan2(0, 0) would.
+        Scheduled thinks pass the scheduler's tick to record in thought_at.
+        Returns the distances.
+        """
+        dx = (target[0] - (self.x[indices] + self.width[indices] // 2)).astype(np.float64)
+        dy = (target[1] - (self.y[indices] + self.height[indices] // 2)).astype(np.float64)
+        distance = np.sqrt(dx * dx + dy * dy)
+        
+        self.state[indices] = np.where(distance <= self.attack_range[indices], ATTACK,
+                                       np.where(distance <= self.detection_range[indices], WALK, IDLE))
+        self.facing_right[indices] = dx > 0
+        
+        apart = distance > 0
+        scale = np.where(apart, distance, 1.0)
+        self.heading_x[indices] = np.where(apart, dx / scale, 1.0)
+        self.heading_y[indices] = dy / scale
+        if tick is not None:
+            self.thought_at[indices] = tick
+        return distance
+    
+    def steer(self, indices, penalties, ticks=1, flow_field=None):
+        """Vectorized velocity pass covering `ticks` ticks of movement.
+        
+        Walking rows follow the flow field where it has a direction, or their
+        heading where it doesn't, at speed times terrain penalty (one penalty
+        per index); everyone else stands still. Cooldowns tick down and
+        previous positions are recorded for every row. Returns the walking
+        rows, which still have to move and resolve collisions one at a time.
+        """
+        self.previous_x[indices] = self.x[indices]
+        self.previous_y[indices] = self.y[indices]
+        self.attack_cooldown[indices] = np.maximum(self.attack_cooldown[indices] - ticks, 0)
+        self.velocity_x[indices] = 0
+        self.velocity_y[indices] = 0
+        
+        is_walking = self.state[indices] == WALK
+        walking = indices[is_walking]
+        direction_x = self.heading_x[walking]
+        direction_y = self.heading_y[walking]
+        if flow_field is not None:
+            flow_x, flow_y, has_flow = flow_field.directions_at(
+                self.x[walking] + self.width[walking] // 2,
+                self.y[walking] + self.height[walking] // 2
+            )
+            direction_x = np.where(has_flow, flow_x, direction_x)
+            direction_y = np.where(has_flow, flow_y, direction_y)
+        
+        scale = self.speed[walking] * np.asarray(penalties, dtype=np.float64)[is_walking] * ticks
+        self.velocity_x[walking] = direction_x * scale
+        self.velocity_y[walking] = direction_y * scale
+        return walking
+    
+    def rest(self, indices, ticks=1):
+        """Cooldown-only pass covering `ticks` ticks, for rows too far away to notice the target.
+        
+        The rows stand idle: cooldowns tick down and previous positions are
+        recorded, as steer() would for a row that doesn't walk.
+        """
+        self.previous_x[indices] = self.x[indices]
+        self.previous_y[indices] = self.y[indices]
+        self.attack_cooldown[indices] = np.maximum(self.attack_cooldown[indices] - ticks, 0)
+        self.velocity_x[indices] = 0
+        self.velocity_y[indices] = 0
+        self.state[indices] = IDLE
+    
+    def rows_in(self, rect):
+        """Indices of the live rows whose rect intersects the given rect, in row order"""
+        if rect.width <= 0 or rect.height <= 0:
+            return np.zeros(0, dtype=np.int64)
+        count = self.count
+        x, y = self.x[:count], self.y[:count]
+        width, height = self.width[:count], self.height[:count]
+        hit = ((x < rect.right) & (x + width > rect.left) & (y < rect.bottom) & (y + height > rect.top)
+               & (width > 0) & (height > 0))
+        return np.flatnonzero(hit)
+    
+    def apply_damage(self, indices, amount):
+        """Subtract damage from each row and return the indices left at or below zero health"""
+        self.health[indices] -= amount
+        return indices[self.health[indices] <= 0]
+
+class EnemyRow:
+    """One enemy row outside any EnemyStore, for enemies not (or no longer) in an EnemyGroup.
+    
+    Each field is a one-item list, so Enemy reads and writes it at index 0
+    the same way as a store row, without allocating any arrays.
+    """
+    def __init__(self):
+        self.__dict__.update({name: [default] for name, _, default in EnemyStore.FIELDS})
+        self.views = []
+        self.count = 0
+    
+    def __len__(self):
+        return self.count
+    
+    def allocate(self, view):
+        self.views = [view]
+        self.count = 1
+        return 0
+    
+    def release(self, index):
+        self.views = []
+        self.count = 0
+    
+    def adopt(self, view):
+        """Move a view's row into this one"""
+        source, source_index = view.store, view.index
+        self.__dict__.update({name: [getattr(source, name)[source_index]] for name, _, _ in EnemyStore.FIELDS})
+        source.release(source_index)
+        view.store = self
+        view.index = self.allocate(view)
+
+class EnemyGroup(pygame.sprite.Group):
+    """Group of enemies whose state lives in one shared EnemyStore.
+    
+    Adding an enemy moves its row into the group's store; removing it moves
+    the row out into an EnemyRow, so removed enemies stay readable.
+    An enemy should belong to at most one EnemyGroup at a time. Spatial
+    queries are vectorized scans over the store instead of a hash, so
+    moving an enemy needs no bookkeeping.
+    """
+    def __init__(self, *sprites):
+        self.store = EnemyStore()
+        super().__init__(*sprites)
+    
+    def add_internal(self, sprite, layer=None):
+        self.store.adopt(sprite)
+        super().add_internal(sprite)
+    
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        EnemyRow().adopt(sprite)
+    
+    def empty(self):
+        # Detach from the last row back, so no row is swapped into a hole
+        for sprite in reversed(self.store.views[:]):
+            self.remove_internal(sprite)
+            sprite.remove_internal(self)
+    
+    def query(self, rect):
+        """Return the enemies whose rect intersects the given rect, in store order"""
+        views = self.store.views
+        return [views[i] for i in self.store.rows_in(rect).tolist()]
+    
+    def advance(self, indices, obstacles, precise=True):
+        """Move rows by their velocity, vectorized where nothing is in the way.
+        
+        Rows whose swept rect (start and end of both axis moves) is clear of
+        every obstacle just take their new position in one pass; only the
+        rest go through collide() one by one.
+        """
+        store = self.store
+        x, y = store.x[indices], store.y[indices]
+        width, height = store.width[indices], store.height[indices]
+        new_x = round_half_away(x + store.velocity_x[indices])
+        new_y = round_half_away(y + store.velocity_y[indices])
+        blocked = obstacles.may_overlap(np.minimum(x, new_x), np.minimum(y, new_y),
+                                        np.maximum(x, new_x) + width, np.maximum(y, new_y) + height)
+        clear = ~blocked
+        store.x[indices[clear]] = new_x[clear]
+        store.y[indices[clear]] = new_y[clear]
+        for i in indices[blocked].tolist():
+            self.collide(i, obstacles, precise)
+    
+    def collide(self, index, obstacles, precise=True):
+        """Move one row by its velocity one axis at a time, pushing it out of obstacles; precise adds mask tests"""
+        store = self.store
+        view = store.views[index]
+        rect = view.bounds()
+        mask = view.mask if precise else None
+        velocity_x = float(store.velocity_x[index])
+        velocity_y = float(store.velocity_y[index])
+        rect.x += velocity_x
+        push_out(rect, mask, obstacles, 'x', velocity_x > 0)
+        rect.y += velocity_y
+        push_out(rect, mask, obstacles, 'y', velocity_y > 0)
+        store.x[index], store.y[index] = rect.topleft
@@ -1,6 +1,7 @@
 import pygame
 import random
 from config import *
+from .assets import assets
 import os
 
 class Terrain(pygame.sprite.Sprite):
@@ -9,16 +10,14 @@ class Terrain(pygame.sprite.Sprite):
         self.terrain_type = terrain_type
         
         try:
-            # Load terrain texture based on type
+            # Load terrain texture based on type, scaled to chunk size
             if terrain_type == 'sea':
-                self.image = pygame.image.load(os.path.join(IMAGES_DIR, 'sea.png')).convert_alpha()
+                path = os.path.join(IMAGES_DIR, 'sea.png')
             elif terrain_type == 'desert':
-                self.image = pygame.image.load(os.path.join(IMAGES_DIR, 'desert.png')).convert_alpha()
+                path = os.path.join(IMAGES_DIR, 'desert.png')
             else:  # hellscape
-                self.image = pygame.image.load(os.path.join(IMAGES_DIR, 'hellscape.png')).convert_alpha()
-            
-            # Scale image to chunk size
-            self.image = pygame.transform.scale(self.image, (width, height))
+                path = os.path.join(IMAGES_DIR, 'hellscape.png')
+            self.image = assets.load_image(path, (width, height))
             
         except (pygame.error, FileNotFoundError):
             # Create fallback colored surface if image loading fails
@@ -54,6 +53,7 @@ class TerrainManager:
         self.screen_width = screen_width
         self.screen_height = screen_height
         self.terrain_grid = []
+        self.terrain_lookup = {}  # (chunk_x, chunk_y) -> terrain type
         self.obstacles = pygame.sprite.Group()
         
         # Terrain generation parameters
@@ -77,6 +77,7 @@ class TerrainManager:
                 )
                 
                 self.terrain_grid.append(terrain)
+                self.terrain_lookup[(x, y)] = terrain_type
                 
                 # Add obstacles based on terrain type
                 if terrain_type == 'sea':
@@ -102,7 +103,6 @@ class TerrainManager:
         self.obstacles.add(obstacle)
     
     def get_terrain_at_position(self, x, y):
-        for terrain in self.terrain_grid:
-            if terrain.rect.collidepoint(x, y):
-                return terrain.terrain_type
-        return 'default' 
+        key = (int(x // self.chunk_size), int(y // self.chunk_size))
+        return self.terrain_lookup.get(key, 'default')
+
@@ -3,14 +3,20 @@ import sys
 import os
 import math
 import random
+import time
 import importlib
+import numpy as np
 from config import *
 from .player import Player
 from .enemy import Enemy
 from .npc import NPC
 from .environment import TerrainManager
+from .assets import assets
+from .atlas import source as atlas_source
+from .preloader import AssetPreloader, game_manifest
+from .text import text_renderer
 from .weapons import WeaponManager
-from .effects import ParticleEffect, AnimationManager
+from .effects import EffectSystem, AnimationManager
 from .sound import SoundManager
 from .menu import Menu
 from .save_system import SaveSystem
@@ -19,13 +25,27 @@ from .quest import QuestManager
 from .ui import UI
 from .particles import ParticleSystem
 from .camera import Camera
+from .pathfinding import FlowField
+from .ai_scheduler import AIScheduler
+from .lod import SimulationLOD
+from .entity_store import EnemyGroup, enemy_types
+from .profiler import Profiler
+from .debug_overlay import ProfilerOverlay
+from .input_state import InputState
+from .replay import InputRecorder, InputReplayer
 
 # Force reload the terrain module
 from . import terrain
 importlib.reload(terrain)
 
 class Game:
-    def __init__(self):
+    def __init__(self, headless=False, seed=None, record_path=None, replay_path=None):
+        # Headless runs use SDL's dummy drivers: no window, no audio device
+        self.headless = headless
+        if headless:
+            os.environ['SDL_VIDEODRIVER'] = 'dummy'
+            os.environ['SDL_AUDIODRIVER'] = 'dummy'
+        
         # Initialize Pygame
         pygame.init()
         pygame.mixer.init()  # Initialize the audio system
@@ -33,42 +53,44 @@ class Game:
         pygame.display.set_caption("Metron-Zero")
         self.clock = pygame.time.Clock()
         
-        # Load sound effects
-        try:
-            self.hit_sound = pygame.mixer.Sound("assets/sounds/hit.wav")
-            self.hit_sound.set_volume(0.3)  # Adjust volume as needed
-        except:
-            print("Warning: Could not load hit sound")
-            self.hit_sound = None
+        # Fixed-timestep simulation clock
+        self.sim_time = 0  # Simulated milliseconds, advanced by TICK_MS per update
+        self.accumulator = 0
+        self.render_alpha = 1.0
+        
+        # Per-phase timings for the F3 overlay; headless runs opt in explicitly
+        self.profiler = Profiler(enabled=not headless)
+        self.profiler_overlay = ProfilerOverlay(self.profiler)
+        
+        # Input snapshots and RNG seeding for reproducible runs
+        self.input = InputState()
+        self.requested_seed = seed
+        self.seed = seed
+        self.record_path = record_path
+        self.recorded_runs = 0  # Lives recorded so far; each restart records to a new file
+        self.replay = InputReplayer(replay_path) if replay_path else None
+        self.time_scale = 1.0  # Simulated time per real time, raised for fast replays
+        
+        # Images and sounds decode in the background while the menu is up;
+        # finish_loading() builds the systems that use them
+        self.preloader = AssetPreloader(game_manifest())
+        self.preloader.start()
+        self.loaded = False
         
         # Initialize game systems
-        self.animation_manager = AnimationManager()
-        self.sound_manager = SoundManager()
         self.save_system = SaveSystem(self)
         self.quest_manager = QuestManager()
         self.menu = Menu(self)
-        self.effects = []
         
         # Initialize sprite groups
         self.all_sprites = pygame.sprite.Group()
-        self.enemies = pygame.sprite.Group()
+        self.enemies = EnemyGroup()
         self.npcs = pygame.sprite.Group()
-        self.obstacles = pygame.sprite.Group()
         
         # Game state
         self.state = 'menu'  # 'menu', 'playing', 'inventory', 'paused'
         self.current_background = 'hellscape'
         
-        # Load backgrounds
-        self.backgrounds = self.load_backgrounds()
-        
-        # Initialize terrain
-        self.terrain_manager = terrain.TerrainManager()
-        self.terrain_manager.generate_terrain()
-        
-        # Add terrain obstacles to obstacle group
-        self.obstacles.add(self.terrain_manager.obstacles)
-        
         # Initialize new systems
         self.weapon_manager = WeaponManager()
         
@@ -78,11 +100,31 @@ class Game:
         # Initialize UI
         self.ui = UI(self)
         
-        # Initialize particles
+        # Initialize particles and the effects drawn with them
         self.particles = ParticleSystem()
+        self.effects = EffectSystem(self.particles)
+        
+        # The streamed world is created per run in setup_game
+        self.terrain_manager = None
+    
+    def finish_loading(self):
+        """Wait for the preloader and build the systems that need its assets"""
+        if self.loaded:
+            return
+        self.preloader.finish()
+        
+        # Own copy of the hit sound so its volume doesn't affect SoundManager's
+        try:
+            self.hit_sound = pygame.mixer.Sound(buffer=assets.load_sound(HIT_SOUND).get_raw())
+            self.hit_sound.set_volume(0.3)  # Adjust volume as needed
+        except pygame.error:
+            print("Warning: Could not load hit sound")
+            self.hit_sound = None
         
-        # Setup initial game state
-        self.setup_game()
+        self.animation_manager = AnimationManager()
+        self.sound_manager = SoundManager()
+        self.backgrounds = self.load_backgrounds()
+        self.loaded = True
         
         # Start background music
         self.sound_manager.play_music('background_music.wav')
@@ -90,17 +132,14 @@ class Game:
     def load_backgrounds(self):
         try:
             return {
-                'sea': pygame.transform.scale(
-                    pygame.image.load(os.path.join(IMAGES_DIR, 'sea.png')).convert_alpha(),
-                    (SCREEN_WIDTH, SCREEN_HEIGHT)
+                'sea': assets.load_image(
+                    os.path.join(IMAGES_DIR, 'sea.png'), (SCREEN_WIDTH, SCREEN_HEIGHT)
                 ),
-                'desert': pygame.transform.scale(
-                    pygame.image.load(os.path.join(IMAGES_DIR, 'desert.png')).convert_alpha(),
-                    (SCREEN_WIDTH, SCREEN_HEIGHT)
+                'desert': assets.load_image(
+                    os.path.join(IMAGES_DIR, 'desert.png'), (SCREEN_WIDTH, SCREEN_HEIGHT)
                 ),
-                'hellscape': pygame.transform.scale(
-                    pygame.image.load(os.path.join(IMAGES_DIR, 'hellscape.png')).convert_alpha(),
-                    (SCREEN_WIDTH, SCREEN_HEIGHT)
+                'hellscape': assets.load_image(
+                    os.path.join(IMAGES_DIR, 'hellscape.png'), (SCREEN_WIDTH, SCREEN_HEIGHT)
                 )
             }
         except pygame.error as e:
@@ -115,21 +154,41 @@ class Game:
             }
 
     def setup_game(self):
+        self.finish_loading()
+        
+        # Seed the global RNG so a recorded seed reproduces the whole run
+        self.start_input_session()
+        random.seed(self.seed)
+        self.sim_time = 0
+        self.accumulator = 0
+        
         # Initialize game objects
         self.player = Player(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2, self)
-        self.enemies = pygame.sprite.Group()
+        self.enemies = EnemyGroup()
         self.npcs = pygame.sprite.Group()
-        self.obstacles = pygame.sprite.Group()
-        self.particles = ParticleSystem()
         
         # Initialize camera
         self.camera = Camera(SCREEN_WIDTH, SCREEN_HEIGHT)
         
-        # Initialize terrain with explicit import
-        self.terrain_manager = terrain.TerrainManager()
+        # Particles draw from their own RNG, seeded from the run's
+        self.particles = ParticleSystem(camera=self.camera, seed=random.getrandbits(32))
+        self.effects = EffectSystem(self.particles)
+        
+        # Initialize terrain with explicit import; the world is generated from the run's seed
+        if self.terrain_manager is not None:
+            self.terrain_manager.close()
+        self.terrain_manager = terrain.TerrainManager(seed=random.getrandbits(32))
+        self.terrain_manager.update(self.player.rect.center)
         
-        # Add terrain obstacles to game obstacles
-        self.obstacles.add(self.terrain_manager.obstacles)
+        # Obstacles live in the terrain manager's spatial group
+        self.obstacles = self.terrain_manager.obstacles
+        
+        # Enemies share one flow field toward the player
+        self.flow_field = FlowField()
+        
+        # Enemy thinking is time-sliced; recorded and replayed runs can't depend on wall-clock time
+        self.ai_scheduler = AIScheduler(adaptive=not (self.record_path or self.replay))
+        self.lod = SimulationLOD()
         
         # Initialize UI
         self.ui = UI(self)
@@ -141,6 +200,38 @@ class Game:
         self.spawn_enemies()
         self.spawn_npcs()
 
+    def start_input_session(self):
+        """Pick the run's seed and hook up input recording or replay"""
+        if self.replay:
+            self.seed = self.replay.seed
+            self.input = InputState()
+            self.input.source = InputReplayer(self.replay.path)
+            return
+        
+        if self.requested_seed is not None:
+            self.seed = self.requested_seed
+        else:
+            self.seed = random.SystemRandom().getrandbits(63)
+        
+        if self.input.recorder:
+            self.input.recorder.close()
+        self.input = InputState()
+        if self.record_path:
+            self.input.recorder = InputRecorder(self.recording_path(), self.seed)
+            self.recorded_runs += 1
+    
+    def recording_path(self):
+        """Where this life records: run.rec, then run-2.rec, run-3.rec... so a restart never overwrites a recording"""
+        if not self.recorded_runs:
+            return self.record_path
+        root, ext = os.path.splitext(self.record_path)
+        return f"{root}-{self.recorded_runs + 1}{ext}"
+    
+    def stop_input_session(self):
+        if self.input.recorder:
+            self.input.recorder.close()
+            self.input.recorder = None
+    
     def spawn_enemies(self):
         # Clear existing enemies
         self.enemies.empty()
@@ -190,14 +281,19 @@ class Game:
                     self.player.inventory.toggle_visibility()
                 elif event.key == pygame.K_t:  # 'T' key toggles radar
                     self.ui.toggle_radar()
+                elif event.key == pygame.K_F3:  # Profiler overlay
+                    self.profiler_overlay.toggle()
+                elif event.key == pygame.K_F4:  # Dump profiler timings
+                    path = self.profiler_overlay.dump()
+                    self.ui.show_message(f"Profile saved to {os.path.basename(path)}.json/.csv")
                 elif event.key == pygame.K_SPACE:
                     if self.state == 'game_over':
                         self.setup_game()
                         self.state = 'playing'
                     else:
-                        self.player.attack()
+                        self.input.queue_press(event.key)  # Attack on the next tick
                 elif event.key == pygame.K_e and self.state == 'playing':
-                    self.player.interact(self.npcs)
+                    self.input.queue_press(event.key)
                 
                 # Quick save/load for testing
                 elif event.key == pygame.K_F5:
@@ -218,10 +314,10 @@ class Game:
     def handle_combat(self):
         if self.player.current_weapon:
             self.sound_manager.play_sound('sword_swing')
-            hit_enemies = pygame.sprite.spritecollide(
-                self.player, self.enemies, False,
-                pygame.sprite.collide_mask
-            )
+            hit_enemies = [
+                enemy for enemy in self.enemies.query(self.player.rect)
+                if pygame.sprite.collide_mask(self.player, enemy)
+            ]
             
             for enemy in hit_enemies:
                 enemy.take_damage(self.player.current_weapon.damage)
@@ -233,12 +329,11 @@ class Game:
                     self.quest_manager.update_quest_progress("QUEST_001", 0)
 
     def create_hit_effect(self, position):
-        effect = ParticleEffect(position[0], position[1], RED)
-        self.effects.append(effect)
+        self.effects.hit_sparks(position, RED)
 
     def create_effect(self, text, position, color):
-        # Create floating text effect
-        pass  # Implement text effect system
+        # Floating text in screen space, e.g. save/load notices
+        self.effects.floating_text(text, position, color, screen_space=True)
 
     def handle_inventory_click(self, pos):
         if self.player.inventory.visible:
@@ -246,79 +341,167 @@ class Game:
             if clicked_item:
                 clicked_item.use(self.player)
 
+    def advance_simulation(self, frame_time):
+        """Run as many fixed ticks as the elapsed frame time covers"""
+        self.accumulator += frame_time * self.time_scale
+        ticks = 0
+        while self.accumulator >= TICK_MS and ticks < MAX_CATCHUP_TICKS:
+            self.update()
+            self.accumulator -= TICK_MS
+            ticks += 1
+        
+        # Drop the backlog rather than spiralling when ticks can't keep up
+        if self.accumulator >= TICK_MS:
+            self.accumulator %= TICK_MS
+        
+        self.render_alpha = self.accumulator / TICK_MS
+
     def update(self):
         if self.state == 'playing':
-            # Update player
-            self.player.update(self.terrain_manager, self.obstacles)
-            
-            # Handle NPC interactions
-            keys = pygame.key.get_pressed()
-            if keys[pygame.K_e]:  # E key for interaction
-                for npc in self.npcs:
-                    if pygame.sprite.collide_rect(self.player, npc):
-                        npc.interact(self.player)
-            
-            # Update enemies
-            for enemy in self.enemies:
-                enemy.update(self.player, self.terrain_manager, self.obstacles)
-            
-            # Check collisions
-            self.check_collisions()
-            
-            # Check victory condition
-            if len(self.enemies) == 0:
-                self.state = 'victory'
-            
-            # Update camera
-            self.camera.update(self.player)
-            
-            # Update UI
-            self.ui.update()
-            
-            # Update particles
-            self.particles.update()
+            profiler = self.profiler
+            with profiler.phase('tick'):
+                if not self.input.begin_tick():
+                    return  # Replay has run out of recorded ticks
+                self.sim_time += TICK_MS
+                
+                # Apply key presses captured for this tick
+                if self.input.was_pressed(pygame.K_SPACE):
+                    self.player.attack()
+                if self.input.was_pressed(pygame.K_e):
+                    self.player.interact(self.npcs)
+                
+                # Update player
+                with profiler.phase('player'):
+                    self.player.update(self.terrain_manager, self.obstacles)
+                
+                # Handle NPC interactions
+                with profiler.phase('npcs'):
+                    keys = self.input
+                    if keys[pygame.K_e]:  # E key for interaction
+                        for npc in self.npcs:
+                            if pygame.sprite.collide_rect(self.player, npc):
+                                npc.interact(self.player)
+                
+                # Refresh the enemies' flow field toward the player
+                with profiler.phase('pathfinding'):
+                    self.flow_field.update(self.player.rect.center, self.terrain_manager, self.obstacles, self.sim_time)
+                
+                # Sort enemies into simulation tiers by distance to the camera
+                with profiler.phase('lod'):
+                    store = self.enemies.store
+                    centers_x, centers_y = store.centers()
+                    near, mid = self.lod.classify(np.column_stack((centers_x, centers_y)), self.camera.world_center())
+                
+                # Let this tick's slice of near enemies pick their state and heading, in one batch
+                target = self.player.rect.center
+                with profiler.phase('ai_think'):
+                    self.ai_scheduler.run_batch(
+                        len(near), lambda batch: store.think(near[batch], target, self.ai_scheduler.tick))
+                
+                # Move near enemies every tick; this tick's share of mid-range ones only run
+                # cooldowns, since they are beyond detection range of the player; far ones sleep
+                with profiler.phase('enemies'):
+                    # Terrain penalties, velocities and moves in vectorized passes; only walking
+                    # enemies near an obstacle resolve collisions one by one
+                    penalties = self.terrain_manager.penalties_at(centers_x[near], centers_y[near])
+                    walking = store.steer(near, penalties, flow_field=self.flow_field)
+                    self.enemies.advance(walking, self.obstacles)
+                    store.animate(near, TICK_MS)
+                    store.rest(mid, ticks=self.lod.mid_interval)
+                
+                # Check collisions
+                with profiler.phase('collisions'):
+                    self.check_collisions()
+                
+                # Check victory condition
+                if len(self.enemies) == 0:
+                    self.state = 'victory'
+                
+                # Update camera
+                with profiler.phase('camera'):
+                    self.camera.update(self.player)
+                
+                # Stream world chunks around the player
+                with profiler.phase('terrain'):
+                    self.terrain_manager.update(self.player.rect.center)
+                
+                # Update UI
+                with profiler.phase('ui_update'):
+                    self.ui.update()
+                
+                # Update particles and other transient effects
+                with profiler.phase('particles_update'):
+                    self.effects.update()
 
     def render(self):
+        profiler = self.profiler
+        
         # Clear screen
         self.screen.fill(BLACK)
         
+        # Blend camera and entities between the last two ticks
+        self.camera.interpolate(self.render_alpha)
+        
         # Draw terrain
-        self.terrain_manager.draw(self.screen, self.camera)
+        with profiler.phase('terrain_draw'):
+            self.terrain_manager.draw(self.screen, self.camera)
         
         # Draw all game objects relative to camera
-        for sprite in sorted(
-            [self.player] + 
-            list(self.enemies) + 
-            list(self.npcs) + 
-            list(self.obstacles), 
-            key=lambda s: s.rect.bottom
-        ):
-            self.screen.blit(sprite.image, self.camera.apply(sprite))
-        
-        # Draw particles
-        self.particles.draw(self.screen, self.camera)
+        with profiler.phase('sprites_draw'):
+            # Frames live on shared atlas pages, so submit them as one batch.
+            # Obstacles are baked into the terrain layer, so only moving sprites are sorted.
+            # Enemies are culled, interpolated and looked up straight from the store.
+            apply_interpolated = self.camera.apply_interpolated
+            page, area = atlas_source(self.player.image)
+            batch = [(page, apply_interpolated(self.player, self.render_alpha), area)]
+            bottoms = [self.player.rect.bottom]
+            
+            store = self.enemies.store
+            view = pygame.Rect(-self.camera.offset[0], -self.camera.offset[1], SCREEN_WIDTH, SCREEN_HEIGHT)
+            rows = store.rows_in(view.inflate(ENEMY_SPEED * 4, ENEMY_SPEED * 4))
+            screen_x, screen_y = self.camera.interpolated_positions(
+                store.x[rows], store.y[rows], store.previous_x[rows], store.previous_y[rows], self.render_alpha
+            )
+            for (page, area), x, y in zip(enemy_types.frame_sources(store, rows), screen_x.tolist(), screen_y.tolist()):
+                batch.append((page, (x, y), area))
+            bottoms.extend((store.y[rows] + store.height[rows]).tolist())
+            
+            for sprite in self.npcs:
+                page, area = atlas_source(sprite.image)
+                batch.append((page, apply_interpolated(sprite, self.render_alpha), area))
+                bottoms.append(sprite.rect.bottom)
+            
+            order = np.argsort(np.array(bottoms, dtype=np.int64), kind='stable')
+            self.screen.blits([batch[i] for i in order.tolist()], doreturn=False)
+        
+        # Draw particles and other transient effects
+        with profiler.phase('particles_draw'):
+            self.effects.draw(self.screen, self.camera)
         
         # Draw UI
-        self.ui.draw(self.screen)
+        with profiler.phase('ui_draw'):
+            self.ui.draw(self.screen)
         
         # Draw inventory if visible
         if self.player.inventory.visible:
             self.player.inventory.draw(self.screen)
         
+        # Profiler overlay goes on top of everything else
+        self.profiler_overlay.draw(self.screen)
+        
         # Update display
-        pygame.display.flip()
+        with profiler.phase('flip'):
+            pygame.display.flip()
 
     def draw_ui(self):
         # Draw player health
         health_text = f"Health: {self.player.health}"
-        health_surface = pygame.font.Font(None, 36).render(health_text, True, WHITE)
-        self.screen.blit(health_surface, (10, 10))
+        text_renderer.draw(self.screen, health_text, 36, WHITE, topleft=(10, 10))
         
         # Draw current weapon
         if self.player.current_weapon:
             weapon_text = f"Weapon: {self.player.current_weapon.name}"
-            weapon_surface = pygame.font.Font(None, 36).render(weapon_text, True, WHITE)
-            self.screen.blit(weapon_surface, (10, 50))
+            text_renderer.draw(self.screen, weapon_text, 36, WHITE, topleft=(10, 50))
         
         # Draw active quests
         self.draw_quest_tracker()
@@ -330,8 +513,7 @@ class Game:
             for objective in quest.objectives:
                 quest_text += f"{objective.current_amount}/{objective.required_amount}"
             
-            quest_surface = pygame.font.Font(None, 24).render(quest_text, True, WHITE)
-            self.screen.blit(quest_surface, (10, y_offset))
+            text_renderer.draw(self.screen, quest_text, 24, WHITE, topleft=(10, y_offset))
             y_offset += 30
 
     def draw_pause_menu(self):
@@ -342,12 +524,11 @@ class Game:
         self.screen.blit(overlay, (0, 0))
         
         # Draw pause menu options
-        pause_text = pygame.font.Font(None, 74).render("PAUSED", True, WHITE)
-        self.screen.blit(pause_text, pause_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2)))
+        text_renderer.draw(self.screen, "PAUSED", 74, WHITE, center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2))
 
     def check_collisions(self):
         # Check player-enemy collisions for damage to player
-        for enemy in self.enemies:
+        for enemy in self.enemies.query(self.player.rect):
             if pygame.sprite.collide_mask(self.player, enemy):
                 if not self.player.invulnerable:
                     self.player.health -= enemy.damage
@@ -358,10 +539,7 @@ class Game:
                         self.hit_sound.play()
                     
                     # Create hit effect
-                    self.particles.create_hit_effect(
-                        self.player.rect.centerx,
-                        self.player.rect.centery
-                    )
+                    self.effects.hit_sparks(self.player.rect.center)
                     
                     # Check if player died
                     if self.player.health <= 0:
@@ -370,35 +548,79 @@ class Game:
         # Check player attack collisions with enemies
         if self.player.is_attacking:
             attack_rect = self.player.get_attack_rect()
-            for enemy in self.enemies:
-                if attack_rect.colliderect(enemy.rect):
-                    # Play hit sound
-                    if self.hit_sound:
-                        self.hit_sound.play()
-                    
-                    # Create hit effect
-                    self.particles.create_hit_effect(
-                        enemy.rect.centerx,
-                        enemy.rect.centery
-                    )
-                    
-                    # Damage and possibly kill enemy
-                    enemy.take_damage(self.player.attack_damage)
-                    if enemy.health <= 0:
-                        self.enemies.remove(enemy)
-                        self.score += 100  # Add score for killing enemy
+            store = self.enemies.store
+            hits = store.rows_in(attack_rect)
+            centers_x = store.x[hits] + store.width[hits] // 2
+            centers_y = store.y[hits] + store.height[hits] // 2
+            for center in zip(centers_x.tolist(), centers_y.tolist()):
+                # Play hit sound
+                if self.hit_sound:
+                    self.hit_sound.play()
+                
+                # Create hit effect
+                self.effects.hit_sparks(center)
+            
+            # Damage every enemy hit in one pass, then remove the dead
+            killed = store.apply_damage(hits, self.player.attack_damage)
+            for enemy in [store.views[i] for i in killed.tolist()]:
+                self.enemies.remove(enemy)
+                self.score += 100  # Add score for killing enemy
+                self.effects.death_burst(enemy.rect.center)
+                self.effects.floating_text("+100", enemy.rect.midtop, (255, 215, 0))
 
+    def run_headless(self, ticks=None, before_tick=None):
+        """Drive update() for a fixed number of ticks without rendering.
+        
+        With ticks=None the run lasts until the replay's input runs out.
+        """
+        if self.state != 'playing':
+            self.setup_game()
+            self.state = 'playing'
+        
+        tick = 0
+        while ticks is None or tick < ticks:
+            pygame.event.pump()  # Keep SDL's event queue from filling up
+            if before_tick:
+                before_tick(self, tick)
+            start = time.perf_counter()
+            self.update()
+            self.profiler.end_frame((time.perf_counter() - start) * 1000.0)
+            if self.input.finished:
+                break
+            tick += 1
+            if self.state != 'playing':
+                break
+        
+        self.stop_input_session()
+        return tick
+    
     def run(self):
         running = True
+        if self.replay:
+            # Replays start straight into the recorded session
+            self.setup_game()
+            self.state = 'playing'
+        
         while running:
+            # Cap the render rate; simulation runs on its own fixed tick
+            frame_time = self.clock.tick(FPS)
+            
             # Handle events based on game state
             if self.state == 'menu':
+                if not self.loaded:
+                    self.preloader.step()
+                    if self.preloader.done:
+                        self.finish_loading()
                 running = self.menu.handle_events()
                 self.menu.draw(self.screen)
             elif self.state == 'playing':
-                running = self.handle_events()
-                self.update()
+                with self.profiler.phase('handle_events'):
+                    running = self.handle_events()
+                self.advance_simulation(frame_time)
                 self.render()
+                self.profiler.end_frame(frame_time)
+                if self.input.finished:
+                    running = False  # Replay has no more input
             elif self.state == 'game_over':
                 # Handle game over events
                 for event in pygame.event.get():
@@ -423,10 +645,8 @@ class Game:
                         elif event.key == pygame.K_ESCAPE:
                             self.state = 'menu'
                 self.menu.draw(self.screen)
-            
-            # Maintain consistent frame rate
-            self.clock.tick(FPS)
 
+        self.stop_input_session()
         pygame.quit()
         sys.exit()
 
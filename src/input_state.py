@@ -0,0 +1,63 @@
+import pygame
+
+# Keys that affect the simulation; their order defines the snapshot bit layout
+TRACKED_KEYS = [
+    pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN,
+    pygame.K_a, pygame.K_d, pygame.K_w, pygame.K_s,
+    pygame.K_e, pygame.K_SPACE
+]
+KEY_BITS = {key: 1 << i for i, key in enumerate(TRACKED_KEYS)}
+
+class InputState:
+    """Per-tick snapshot of gameplay input.
+    
+    Every simulation read of the keyboard goes through this object, so a
+    tick sees the same input whether it comes from the live keyboard or a
+    recorded replay. Snapshots are two bitmasks over TRACKED_KEYS: keys
+    held during the tick and keys pressed since the previous tick.
+    """
+    def __init__(self):
+        self.held = 0
+        self.pressed = 0
+        self.pending_presses = 0
+        self.source = None  # Replay to read snapshots from instead of the keyboard
+        self.recorder = None  # Recorder that receives every live snapshot
+        self.finished = False
+    
+    def queue_press(self, key):
+        """Remember a key-down event until the next tick consumes it"""
+        if self.source is None and key in KEY_BITS:
+            self.pending_presses |= KEY_BITS[key]
+    
+    def begin_tick(self):
+        """Capture the input snapshot used by the upcoming tick.
+        
+        Returns False once a replay source has no snapshots left.
+        """
+        if self.source is not None:
+            snapshot = self.source.next_snapshot()
+            if snapshot is None:
+                self.finished = True
+                self.held = self.pressed = 0
+                return False
+            self.held, self.pressed = snapshot
+        else:
+            keys = pygame.key.get_pressed()
+            held = 0
+            for key, bit in KEY_BITS.items():
+                if keys[key]:
+                    held |= bit
+            self.held = held
+            self.pressed = self.pending_presses
+            self.pending_presses = 0
+        
+        if self.recorder is not None:
+            self.recorder.record(self.held, self.pressed)
+        return True
+    
+    def was_pressed(self, key):
+        return bool(self.pressed & KEY_BITS.get(key, 0))
+    
+    def __getitem__(self, key):
+        """Mirror pygame.key.get_pressed() so callers can index by key code"""
+        return bool(self.held & KEY_BITS.get(key, 0))
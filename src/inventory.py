@@ -1,5 +1,6 @@
 import pygame
 from config import *
+from .text import text_renderer
 
 class InventoryItem:
     def __init__(self, name, item_type, properties=None):
@@ -27,7 +28,7 @@ class Inventory:
         self.visible = False
         
         # UI elements
-        self.font = pygame.font.Font(None, 32)
+        self.font_size = 32
         self.item_rects = []
         self.setup_ui()
     
@@ -85,14 +86,12 @@ class Inventory:
             # Draw item if it exists
             if i < len(self.items):
                 item = self.items[i]
-                text = self.font.render(item.name[0], True, WHITE)
-                text_rect = text.get_rect(center=adjusted_rect.center)
-                surface.blit(text, text_rect)
+                text_renderer.draw(surface, item.name[0], self.font_size, WHITE, center=adjusted_rect.center)
                 
                 # Draw quantity if more than 1
                 if item.quantity > 1:
-                    quantity_text = self.font.render(str(item.quantity), True, WHITE)
-                    surface.blit(quantity_text, adjusted_rect.bottomright)
+                    text_renderer.draw(surface, str(item.quantity), self.font_size, WHITE,
+                                       topleft=adjusted_rect.bottomright)
     
     def get_save_data(self):
         return [
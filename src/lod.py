@@ -0,0 +1,48 @@
+import numpy as np
+from config import *
+
+# Simulation levels of detail
+LOD_NEAR = 0  # Full simulation: scheduled thinking, per-tick movement, mask collisions, animation
+LOD_MID = 1  # Cooldowns only, every LOD_MID_INTERVAL ticks: always beyond detection range of the player
+LOD_FAR = 2  # Asleep until back inside LOD_WAKE_RADIUS
+
+class SimulationLOD:
+    """Assigns each enemy a simulation tier from its distance to the camera.
+    
+    Tiers are recomputed every tick in one vectorized pass over the enemy
+    centres, so waking up is immediate. Mid-range enemies are staggered by
+    their index so only 1 / LOD_MID_INTERVAL of them update on any tick.
+    
+    The mid tier starts LOD_NEAR_RADIUS from the camera, which follows the
+    player, so its enemies can never be within detection range; until a
+    mid-range behaviour exists they skip thinking and steering and only
+    run their cooldowns.
+    """
+    def __init__(self, near_radius=LOD_NEAR_RADIUS, wake_radius=LOD_WAKE_RADIUS, mid_interval=LOD_MID_INTERVAL):
+        self.near_radius = near_radius
+        self.wake_radius = wake_radius
+        self.mid_interval = mid_interval
+        self.tick = 0
+        self.counts = [0, 0, 0]  # Enemies per tier on the last tick
+    
+    def classify(self, centers, focus):
+        """Return (near, mid_due) index arrays into centers for this tick"""
+        self.tick += 1
+        distance_sq = ((centers - focus) ** 2).sum(axis=1)
+        tiers = np.full(len(centers), LOD_FAR, dtype=np.uint8)
+        tiers[distance_sq <= self.wake_radius ** 2] = LOD_MID
+        tiers[distance_sq <= self.near_radius ** 2] = LOD_NEAR
+        self.counts = np.bincount(tiers, minlength=3).tolist()
+        
+        near = np.flatnonzero(tiers == LOD_NEAR)
+        due = (np.arange(len(centers)) + self.tick) % self.mid_interval == 0
+        mid_due = np.flatnonzero((tiers == LOD_MID) & due)
+        return near, mid_due
+    
+    def near_of(self, centers, focus):
+        """Indices into centers of the near tier, without advancing the tick"""
+        return np.flatnonzero(((centers - focus) ** 2).sum(axis=1) <= self.near_radius ** 2)
+    
+    def stats(self):
+        near, mid, far = self.counts
+        return {'near': near, 'mid': mid, 'far': far}
@@ -1,11 +1,12 @@
 import pygame
 from config import *
+from .text import text_renderer
 
 class Menu:
     def __init__(self, game):
         self.game = game
-        self.font = pygame.font.Font(None, 74)
-        self.small_font = pygame.font.Font(None, 36)
+        self.font_size = 74
+        self.small_font_size = 36
         self.selected_option = 0
         self.options = ['Start Game', 'Quit']
         
@@ -43,53 +44,57 @@ class Menu:
         
         if self.game.state == 'menu':
             # Draw title
-            title = self.font.render('Metron-Zero', True, WHITE)
-            title_rect = title.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 4))
-            screen.blit(title, title_rect)
+            text_renderer.draw(screen, 'Metron-Zero', self.font_size, WHITE,
+                               center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 4))
             
             # Draw menu options
             for i, option in enumerate(self.options):
                 color = RED if i == self.selected_option else WHITE
-                text = self.small_font.render(option, True, color)
                 pos = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + i * 50)
-                text_rect = text.get_rect(center=pos)
-                screen.blit(text, text_rect)
+                text_renderer.draw(screen, option, self.small_font_size, color, center=pos)
         
         elif self.game.state == 'game_over':
             # Draw game over screen
-            game_over = self.font.render('Game Over', True, RED)
-            game_over_rect = game_over.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3))
-            screen.blit(game_over, game_over_rect)
+            text_renderer.draw(screen, 'Game Over', self.font_size, RED,
+                               center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3))
             
             # Draw score
-            score_text = self.small_font.render(f'Final Score: {self.game.score}', True, WHITE)
-            score_rect = score_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
-            screen.blit(score_text, score_rect)
+            text_renderer.draw(screen, f'Final Score: {self.game.score}', self.small_font_size, WHITE,
+                               center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
             
             # Draw restart instructions
-            restart_text = self.small_font.render('Press SPACE to restart or ESC to quit', True, WHITE)
-            restart_rect = restart_text.get_rect(center=(SCREEN_WIDTH // 2, 2 * SCREEN_HEIGHT // 3))
-            screen.blit(restart_text, restart_rect)
+            text_renderer.draw(screen, 'Press SPACE to restart or ESC to quit', self.small_font_size, WHITE,
+                               center=(SCREEN_WIDTH // 2, 2 * SCREEN_HEIGHT // 3))
         
         elif self.game.state == 'victory':
             # Draw victory screen
-            victory_text = self.font.render('Victory!', True, (0, 255, 0))  # Green color
-            victory_rect = victory_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3))
-            screen.blit(victory_text, victory_rect)
+            text_renderer.draw(screen, 'Victory!', self.font_size, (0, 255, 0),
+                               center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3))  # Green color
             
             # Draw score
-            score_text = self.small_font.render(f'Final Score: {self.game.score}', True, WHITE)
-            score_rect = score_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
-            screen.blit(score_text, score_rect)
+            text_renderer.draw(screen, f'Final Score: {self.game.score}', self.small_font_size, WHITE,
+                               center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
             
             # Draw congratulations
-            congrats_text = self.small_font.render('Congratulations! You defeated all enemies!', True, WHITE)
-            congrats_rect = congrats_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 50))
-            screen.blit(congrats_text, congrats_rect)
+            text_renderer.draw(screen, 'Congratulations! You defeated all enemies!', self.small_font_size, WHITE,
+                               center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 50))
             
             # Draw restart instructions
-            restart_text = self.small_font.render('Press SPACE to play again or ESC to quit', True, WHITE)
-            restart_rect = restart_text.get_rect(center=(SCREEN_WIDTH // 2, 2 * SCREEN_HEIGHT // 3))
-            screen.blit(restart_text, restart_rect)
+            text_renderer.draw(screen, 'Press SPACE to play again or ESC to quit', self.small_font_size, WHITE,
+                               center=(SCREEN_WIDTH // 2, 2 * SCREEN_HEIGHT // 3))
+        
+        # Assets still loading in the background
+        preloader = self.game.preloader
+        if not preloader.done:
+            self.draw_progress(screen, preloader.progress)
         
         pygame.display.flip()
+    
+    def draw_progress(self, screen, progress):
+        bar = pygame.Rect(SCREEN_WIDTH // 4, SCREEN_HEIGHT - 80, SCREEN_WIDTH // 2, 16)
+        pygame.draw.rect(screen, (60, 60, 60), bar)
+        pygame.draw.rect(screen, WHITE, (bar.x, bar.y, int(bar.width * progress), bar.height))
+        pygame.draw.rect(screen, WHITE, bar, 1)
+        
+        text_renderer.draw(screen, f'Loading assets... {int(progress * 100)}%', self.small_font_size, WHITE,
+                           midbottom=(SCREEN_WIDTH // 2, bar.y - 6))
@@ -1,5 +1,7 @@
+import os
 import pygame
 from config import *
+from .assets import assets
 from .weapons import Weapon
 import random
 
@@ -10,16 +12,10 @@ class NPC(pygame.sprite.Sprite):  # Make sure the class is named NPC, not npc
         
         # Load appropriate sprite based on NPC type
         try:
-            self.image = pygame.image.load(f"assets/images/npcs/{npc_type}.png").convert_alpha()
-        except:
+            self.image = assets.load_image(os.path.join(IMAGES_DIR, 'npcs', f"{npc_type}.png"), packed=True)
+        except (pygame.error, FileNotFoundError):
             # Create colored rectangle as fallback
-            self.image = pygame.Surface((32, 32))
-            if npc_type == 'merchant':
-                self.image.fill((255, 215, 0))  # Gold for merchant
-            elif npc_type == 'healer':
-                self.image.fill((255, 182, 193))  # Pink for healer
-            else:  # quest_giver
-                self.image.fill((147, 112, 219))  # Purple for quest giver
+            self.image = assets.get_or_create(('npc_placeholder', npc_type), lambda: assets.pack(self.create_placeholder(npc_type)))
         
         self.rect = self.image.get_rect()
         self.rect.x = x
@@ -46,6 +42,16 @@ class NPC(pygame.sprite.Sprite):  # Make sure the class is named NPC, not npc
         # Initial stock
         self.restock_inventory()
     
+    def create_placeholder(self, npc_type):
+        image = pygame.Surface((32, 32))
+        if npc_type == 'merchant':
+            image.fill((255, 215, 0))  # Gold for merchant
+        elif npc_type == 'healer':
+            image.fill((255, 182, 193))  # Pink for healer
+        else:  # quest_giver
+            image.fill((147, 112, 219))  # Purple for quest giver
+        return image
+    
     def restock_inventory(self):
         if random.random() < 0.5:  # 50% chance to restock
             self.weapons_inventory = [
@@ -67,7 +73,7 @@ class NPC(pygame.sprite.Sprite):  # Make sure the class is named NPC, not npc
 
     def interact(self, player):
         """Handle player interaction based on NPC type"""
-        current_time = pygame.time.get_ticks()
+        current_time = player.game.sim_time
         
         # Check cooldown
         if current_time - self.last_interaction < self.interaction_cooldown:
@@ -1,112 +1,231 @@
 import pygame
 import random
 import math
+import numpy as np
 from config import *
 
-class Particle:
-    def __init__(self, x, y, color, velocity, lifetime, size=3):
-        self.x = x
-        self.y = y
-        self.color = color
-        self.velocity_x = velocity[0]
-        self.velocity_y = velocity[1]
-        self.lifetime = lifetime
-        self.max_lifetime = lifetime
-        self.size = size
-        self.alpha = 255
+class ParticleSystem:
+    """Particles stored as parallel NumPy arrays (structure of arrays).
     
-    def update(self):
-        # Update position
-        self.x += self.velocity_x
-        self.y += self.velocity_y
+    Live particles occupy slots [0, count) of a pool preallocated to the
+    particle budget. Each tick integrates every live particle in a few
+    vectorised operations, and dead particles are removed by moving live
+    ones from the tail into their slots. Drawing batches one prerendered
+    circle sprite per (size, color, alpha level) into a single
+    Surface.blits() call.
+    
+    Emitters ask for a burst size and get back what the budget allows:
+    each effect may fill only its priority's share of the pool, bursts
+    shrink once that share is mostly used, and emitters outside the
+    camera view are culled. Emission randomness comes from the system's
+    own RNG so particle settings never change the gameplay RNG stream.
+    """
+    GRAVITY = 0.1
+    DRAG = 0.98
+    
+    def __init__(self, budget=PARTICLE_BUDGET, camera=None, seed=None, quality=PARTICLE_QUALITY):
+        self.count = 0
+        self.camera = camera  # Used to cull off-screen emitters; None disables culling
+        self.rng = random.Random(seed)
+        self.quality = quality  # Scales every burst, e.g. 0.5 for low settings
+        self.colors = []  # Palette of (r, g, b); particles store an index into it
+        self.color_ids = {}
+        self.sprites = {}  # Packed (size, color index, alpha level) key -> Surface
+        self.dropped = 0  # Particles not emitted because of budget, quality or culling
+        self.allocate(budget)
+    
+    def allocate(self, capacity):
+        self.capacity = capacity
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.velocity_x = np.zeros(capacity)
+        self.velocity_y = np.zeros(capacity)
+        self.lifetime = np.zeros(capacity, dtype=np.int32)
+        self.max_lifetime = np.ones(capacity, dtype=np.int32)
+        self.size = np.zeros(capacity, dtype=np.int32)
+        self.color = np.zeros(capacity, dtype=np.int32)
+    
+    def set_budget(self, budget):
+        """Resize the pool in place, keeping live particles (the newest are dropped if it shrinks)"""
+        count = min(self.count, budget)
+        old = self.arrays()
+        self.allocate(budget)
+        for array, previous in zip(self.arrays(), old):
+            array[:count] = previous[:count]
+        self.count = count
+    
+    def arrays(self):
+        return (self.x, self.y, self.velocity_x, self.velocity_y,
+                self.lifetime, self.max_lifetime, self.size, self.color)
+    
+    def __len__(self):
+        return self.count
+    
+    def allowance(self, x, y, requested, effect):
+        """How many of the requested particles an effect at (x, y) may emit"""
+        if self.camera is not None:
+            view = self.camera.camera
+            margin = PARTICLE_CULL_MARGIN
+            if not (-view.x - margin <= x < -view.x + view.width + margin and 
+                    -view.y - margin <= y < -view.y + view.height + margin):
+                self.dropped += requested
+                return 0
         
-        # Apply gravity
-        self.velocity_y += 0.1
+        allowed = requested
+        if self.quality < 1.0:
+            allowed = max(1, round(allowed * self.quality)) if self.quality > 0 else 0
         
-        # Update lifetime and alpha
-        self.lifetime -= 1
-        self.alpha = int((self.lifetime / self.max_lifetime) * 255)
+        # Each effect may fill only its share of the pool, tapering off near it
+        ceiling = int(self.capacity * PARTICLE_PRIORITIES.get(effect, 1.0))
+        soft_limit = int(ceiling * PARTICLE_SOFT_LIMIT)
+        if self.count > soft_limit:
+            allowed = int(allowed * (ceiling - self.count) / max(1, ceiling - soft_limit))
+        allowed = max(0, min(allowed, ceiling - self.count))
         
-        # Slow down
-        self.velocity_x *= 0.98
-        self.velocity_y *= 0.98
+        self.dropped += requested - allowed
+        return allowed
     
-    def is_alive(self):
-        return self.lifetime > 0
-
-class ParticleSystem:
-    def __init__(self):
-        self.particles = []
+    def emit(self, x, y, color, velocity, lifetime, size=3):
+        """Add one particle, if the pool has a free slot"""
+        if self.count == self.capacity:
+            self.dropped += 1
+            return False
+        color_id = self.color_ids.get(color)
+        if color_id is None:
+            color_id = self.color_ids[color] = len(self.colors)
+            self.colors.append(color)
+        
+        i = self.count
+        self.x[i] = x
+        self.y[i] = y
+        self.velocity_x[i], self.velocity_y[i] = velocity
+        self.lifetime[i] = lifetime
+        self.max_lifetime[i] = lifetime
+        self.size[i] = size
+        self.color[i] = color_id
+        self.count += 1
+        return True
     
     def update(self):
-        # Update all particles and remove dead ones
-        self.particles = [p for p in self.particles if p.is_alive()]
-        for particle in self.particles:
-            particle.update()
+        # Remove particles that expired last tick, then integrate the rest
+        self.compact()
+        n = self.count
+        if not n:
+            return
+        
+        velocity_x = self.velocity_x[:n]
+        velocity_y = self.velocity_y[:n]
+        self.x[:n] += velocity_x
+        self.y[:n] += velocity_y
+        
+        # Apply gravity, age, then slow down
+        velocity_y += self.GRAVITY
+        self.lifetime[:n] -= 1
+        velocity_x *= self.DRAG
+        velocity_y *= self.DRAG
+    
+    def compact(self):
+        """Swap-remove dead particles: live ones from the tail fill their slots"""
+        n = self.count
+        dead = np.flatnonzero(self.lifetime[:n] <= 0)
+        if not len(dead):
+            return
+        
+        live_count = n - len(dead)
+        holes = dead[dead < live_count]
+        tail = np.flatnonzero(self.lifetime[live_count:n] > 0) + live_count
+        for values in self.arrays():
+            values[holes] = values[tail]
+        self.count = live_count
     
     def draw(self, screen, camera):
-        # Draw all particles
-        for particle in self.particles:
-            if particle.alpha > 0:
-                # Create a surface for the particle with alpha
-                particle_surface = pygame.Surface((particle.size * 2, particle.size * 2), pygame.SRCALPHA)
-                
-                # Draw the particle with current alpha
-                pygame.draw.circle(
-                    particle_surface,
-                    (*particle.color, particle.alpha),
-                    (particle.size, particle.size),
-                    particle.size
-                )
-                
-                # Apply camera offset and draw
-                pos = camera.apply_rect(pygame.Rect(
-                    particle.x - particle.size,
-                    particle.y - particle.size,
-                    particle.size * 2,
-                    particle.size * 2
-                ))
-                screen.blit(particle_surface, pos)
+        n = self.count
+        if not n:
+            return
+        
+        # Same fade as before: alpha = lifetime / max_lifetime * 255
+        alpha = (self.lifetime[:n] / self.max_lifetime[:n] * 255).astype(np.int32)
+        level = -(-alpha * PARTICLE_ALPHA_LEVELS // 255)  # Ceil so faint particles stay visible
+        visible = np.flatnonzero(level > 0)
+        if not len(visible):
+            return
+        
+        size = self.size[visible]
+        offset_x, offset_y = camera.offset
+        xs = (self.x[visible] - size).astype(np.int64) + offset_x
+        ys = (self.y[visible] - size).astype(np.int64) + offset_y
+        
+        # Skip particles entirely off screen
+        width, height = screen.get_size()
+        on_screen = np.flatnonzero((xs > -2 * size) & (xs < width) & (ys > -2 * size) & (ys < height))
+        if len(on_screen) < len(visible):
+            visible, size, xs, ys = visible[on_screen], size[on_screen], xs[on_screen], ys[on_screen]
+        
+        # One sprite per distinct (size, color, alpha level), packed into an int key
+        keys = (size.astype(np.int64) << 24) | (self.color[visible].astype(np.int64) << 8) | level[visible]
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        sprites = np.empty(len(unique_keys), dtype=object)
+        for i, key in enumerate(unique_keys.tolist()):
+            sprites[i] = self.sprites.get(key) or self.render_sprite(key)
+        
+        screen.blits(zip(sprites[inverse].tolist(), zip(xs.tolist(), ys.tolist())), doreturn=False)
+    
+    def render_sprite(self, key):
+        size, color_id, level = key >> 24, (key >> 8) & 0xFFFF, key & 0xFF
+        alpha = min(255, round(level * 255 / PARTICLE_ALPHA_LEVELS))
+        sprite = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+        pygame.draw.circle(sprite, (*self.colors[color_id], alpha), (size, size), size)
+        self.sprites[key] = sprite
+        return sprite
     
     def create_hit_effect(self, x, y, color=(255, 255, 255)):
         """Create particles for a hit effect"""
-        num_particles = random.randint(5, 8)
+        rng = self.rng
+        num_particles = self.allowance(x, y, rng.randint(5, 8), 'hit')
         for _ in range(num_particles):
-            angle = random.uniform(0, math.pi * 2)
-            speed = random.uniform(2, 5)
+            angle = rng.uniform(0, math.pi * 2)
+            speed = rng.uniform(2, 5)
             velocity = (math.cos(angle) * speed, math.sin(angle) * speed)
-            lifetime = random.randint(20, 30)
-            size = random.randint(2, 4)
-            self.particles.append(Particle(x, y, color, velocity, lifetime, size))
+            lifetime = rng.randint(20, 30)
+            size = rng.randint(2, 4)
+            self.emit(x, y, color, velocity, lifetime, size)
+        return num_particles
     
     def create_death_effect(self, x, y, color=(255, 0, 0)):
         """Create particles for a death effect"""
-        num_particles = random.randint(15, 20)
+        rng = self.rng
+        num_particles = self.allowance(x, y, rng.randint(15, 20), 'death')
         for _ in range(num_particles):
-            angle = random.uniform(0, math.pi * 2)
-            speed = random.uniform(3, 7)
+            angle = rng.uniform(0, math.pi * 2)
+            speed = rng.uniform(3, 7)
             velocity = (math.cos(angle) * speed, math.sin(angle) * speed)
-            lifetime = random.randint(30, 45)
-            size = random.randint(3, 6)
-            self.particles.append(Particle(x, y, color, velocity, lifetime, size))
+            lifetime = rng.randint(30, 45)
+            size = rng.randint(3, 6)
+            self.emit(x, y, color, velocity, lifetime, size)
+        return num_particles
     
     def create_movement_trail(self, x, y, color=(100, 100, 255)):
         """Create particles for movement trail"""
-        if random.random() < 0.3:  # Only create particles sometimes
-            velocity = (random.uniform(-0.5, 0.5), random.uniform(-0.5, 0.5))
-            lifetime = random.randint(10, 20)
-            size = random.randint(2, 3)
-            self.particles.append(Particle(x, y, color, velocity, lifetime, size))
+        rng = self.rng
+        if rng.random() < 0.3 and self.allowance(x, y, 1, 'trail'):  # Only create particles sometimes
+            velocity = (rng.uniform(-0.5, 0.5), rng.uniform(-0.5, 0.5))
+            lifetime = rng.randint(10, 20)
+            size = rng.randint(2, 3)
+            self.emit(x, y, color, velocity, lifetime, size)
+            return 1
+        return 0
     
     def create_attack_effect(self, x, y, direction, color=(255, 255, 0)):
         """Create particles for attack effect"""
-        num_particles = random.randint(8, 12)
+        rng = self.rng
+        num_particles = self.allowance(x, y, rng.randint(8, 12), 'attack')
         spread = math.pi / 4  # 45-degree spread
         
         for _ in range(num_particles):
-            angle = direction + random.uniform(-spread, spread)
-            speed = random.uniform(4, 8)
+            angle = direction + rng.uniform(-spread, spread)
+            speed = rng.uniform(4, 8)
             velocity = (math.cos(angle) * speed, math.sin(angle) * speed)
-            lifetime = random.randint(15, 25)
-            size = random.randint(2, 4)
-            self.particles.append(Particle(x, y, color, velocity, lifetime, size)) 
\ No newline at end of file
+            lifetime = rng.randint(15, 25)
+            size = rng.randint(2, 4)
+            self.emit(x, y, color, velocity, lifetime, size)
+        return num_particles
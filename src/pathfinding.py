@@ -0,0 +1,177 @@
+import heapq
+import math
+import time
+import numpy as np
+import pygame
+from config import *
+
+# Neighbour offsets with their step length
+NEIGHBOURS = [
+    (1, 0, 1.0), (-1, 0, 1.0), (0, 1, 1.0), (0, -1, 1.0),
+    (1, 1, math.sqrt(2)), (1, -1, math.sqrt(2)), (-1, 1, math.sqrt(2)), (-1, -1, math.sqrt(2))
+]
+
+class FlowField:
+    """Shared steering field toward a goal (the player) for every enemy.
+    
+    One Dijkstra pass outward from the goal cell over a square window of
+    PATHFINDING_CELL_SIZE cells gives every reachable cell the direction of
+    its next step along the cheapest path. Moving through a cell costs its
+    step length divided by the terrain's movement penalty, and cells under an
+    obstacle are blocked (diagonal steps may not cut their corners). Looking
+    up a direction is then O(1) per enemy, however many enemies there are.
+    
+    update() spreads each rebuild over ticks, settling at most
+    PATHFINDING_CELLS_PER_TICK cells per tick, and keeps steering by the
+    previous field until the new one is complete. The budget counts cells
+    rather than time, so replays see the same fields on the same ticks.
+    """
+    def __init__(self, radius=PATHFINDING_RADIUS, cell_size=PATHFINDING_CELL_SIZE):
+        self.radius = radius
+        self.cell_size = cell_size
+        self.size = radius * 2 + 1
+        self.origin = (0, 0)  # Global cell coordinate of window cell [0, 0]
+        self.goal = None  # Global cell coordinate of the goal
+        self.directions = []  # Flat, x-major: (dx, dy) unit step per cell, or None
+        self.direction_x = np.zeros(0)  # The same directions as arrays, for batched lookups
+        self.direction_y = np.zeros(0)
+        self.has_direction = np.zeros(0, dtype=bool)
+        self.built_at = None
+        self.builds = 0
+        self.pending = None  # Rebuild in progress, as a search() generator
+        self.pending_ms = 0.0
+        self.pending_ticks = 0
+        self.build_ms = 0.0  # Total time of the last completed rebuild, across its ticks
+        self.build_ticks = 0  # Ticks the last completed rebuild was spread over
+        self.max_build_ms = 0.0
+        self.max_step_ms = 0.0  # Longest single tick of rebuilding
+    
+    def update(self, goal, terrain_manager, obstacles, sim_time):
+        """Start a rebuild at most every PATHFINDING_INTERVAL ms once the goal changes cell, and advance the one in progress"""
+        if self.pending is None:
+            if self.built_at is not None and sim_time - self.built_at < PATHFINDING_INTERVAL:
+                return
+            cell = (int(goal[0] // self.cell_size), int(goal[1] // self.cell_size))
+            if cell == self.goal:
+                return
+            self.pending = self.search(cell, terrain_manager, obstacles, PATHFINDING_CELLS_PER_TICK)
+            self.pending_ms = 0.0
+            self.pending_ticks = 0
+            self.built_at = sim_time
+        
+        start = time.perf_counter()
+        done = next(self.pending, True)
+        step_ms = (time.perf_counter() - start) * 1000.0
+        self.pending_ms += step_ms
+        self.pending_ticks += 1
+        self.max_step_ms = max(self.max_step_ms, step_ms)
+        if done:
+            self.pending = None
+            self.build_ms = self.pending_ms
+            self.build_ticks = self.pending_ticks
+            self.max_build_ms = max(self.max_build_ms, self.build_ms)
+    
+    def build(self, goal, terrain_manager, obstacles):
+        """Rebuild the whole field toward a goal cell in one go"""
+        for _ in self.search(goal, terrain_manager, obstacles, math.inf):
+            pass
+    
+    def search(self, goal, terrain_manager, obstacles, budget):
+        """Generator that rebuilds the field, pausing (yielding False) after every budget cells settled.
+        
+        The finished field replaces the current one only when the search ends.
+        """
+        size = self.size
+        cell_size = self.cell_size
+        origin_x = goal[0] - self.radius
+        origin_y = goal[1] - self.radius
+        
+        # Cost of crossing each cell, from the terrain penalty at its centre
+        local_x, local_y = np.mgrid[0:size, 0:size]
+        xs = ((local_x + origin_x) * cell_size + cell_size // 2).ravel()
+        ys = ((local_y + origin_y) * cell_size + cell_size // 2).ravel()
+        cost = (1.0 / terrain_manager.penalties_at(xs, ys).astype(np.float64)).tolist()
+        
+        # Cells touched by an obstacle are blocked
+        blocked = np.zeros((size, size), dtype=bool)
+        window = pygame.Rect(origin_x * cell_size, origin_y * cell_size, size * cell_size, size * cell_size)
+        for obstacle in obstacles.query(window):
+            rect = obstacle.rect
+            min_x = max(rect.left // cell_size - origin_x, 0)
+            min_y = max(rect.top // cell_size - origin_y, 0)
+            max_x = min((rect.right - 1) // cell_size - origin_x, size - 1)
+            max_y = min((rect.bottom - 1) // cell_size - origin_y, size - 1)
+            blocked[min_x:max_x + 1, min_y:max_y + 1] = True
+        start = self.radius * size + self.radius
+        blocked[self.radius, self.radius] = False  # The goal itself is always reachable
+        blocked = blocked.ravel().tolist()
+        
+        # Dijkstra outward from the goal; each cell points back along the edge that reached it
+        distance = [math.inf] * (size * size)
+        directions = [None] * (size * size)
+        distance[start] = 0.0
+        heap = [(0.0, start)]
+        steps = [(dx, dy, dx * size + dy, length, (-dx / length, -dy / length)) for dx, dy, length in NEIGHBOURS]
+        settled = 0
+        while heap:
+            current, index = heapq.heappop(heap)
+            if current > distance[index]:
+                continue
+            if settled >= budget:
+                yield False
+                settled = 0
+            settled += 1
+            x, y = divmod(index, size)
+            for dx, dy, offset, length, direction in steps:
+                nx = x + dx
+                ny = y + dy
+                if not (0 <= nx < size and 0 <= ny < size):
+                    continue
+                neighbour = index + offset
+                if blocked[neighbour]:
+                    continue
+                if dx and dy and (blocked[index + dx * size] or blocked[index + dy]):
+                    continue  # No cutting obstacle corners
+                candidate = current + length * (cost[index] + cost[neighbour]) * 0.5
+                if candidate < distance[neighbour]:
+                    distance[neighbour] = candidate
+                    directions[neighbour] = direction
+                    heapq.heappush(heap, (candidate, neighbour))
+        
+        self.origin = (origin_x, origin_y)
+        self.goal = goal
+        self.directions = directions
+        self.direction_x = np.array([direction[0] if direction else 0.0 for direction in directions])
+        self.direction_y = np.array([direction[1] if direction else 0.0 for direction in directions])
+        self.has_direction = np.array([direction is not None for direction in directions], dtype=bool)
+        self.builds += 1
+    
+    def stats(self):
+        """Rebuild counts and wall-clock costs, for profiling"""
+        return {
+            'builds': self.builds,
+            'build_ms': self.build_ms,
+            'build_ticks': self.build_ticks,
+            'max_build_ms': self.max_build_ms,
+            'max_step_ms': self.max_step_ms
+        }
+    
+    def direction_at(self, x, y):
+        """Unit steering direction at a world position, or None outside the field, in the goal cell or when cut off"""
+        if self.goal is None:
+            return None
+        cell_x = int(x // self.cell_size) - self.origin[0]
+        cell_y = int(y // self.cell_size) - self.origin[1]
+        if not (0 <= cell_x < self.size and 0 <= cell_y < self.size):
+            return None
+        return self.directions[cell_x * self.size + cell_y]
+    
+    def directions_at(self, xs, ys):
+        """direction_at() for arrays of positions: (dx, dy, valid), with valid False where there's no direction"""
+        if self.goal is None:
+            return np.zeros(len(xs)), np.zeros(len(xs)), np.zeros(len(xs), dtype=bool)
+        cell_x = xs // self.cell_size - self.origin[0]
+        cell_y = ys // self.cell_size - self.origin[1]
+        inside = (cell_x >= 0) & (cell_x < self.size) & (cell_y >= 0) & (cell_y < self.size)
+        cells = np.where(inside, cell_x * self.size + cell_y, 0)
+        return self.direction_x[cells], self.direction_y[cells], inside & self.has_direction[cells]
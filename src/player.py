@@ -4,6 +4,7 @@ from .weapons import Weapon, WeaponManager
 from .inventory import Inventory
 import math
 from .animation import DirectionalAnimation
+from .text import text_renderer
 
 class Player(pygame.sprite.Sprite):
     def __init__(self, x, y, game):
@@ -15,13 +16,14 @@ class Player(pygame.sprite.Sprite):
         self.rect = self.image.get_rect()
         self.rect.x = x
         self.rect.y = y
-        self.mask = pygame.mask.from_surface(self.image)
+        self.previous_position = self.rect.topleft
+        self.mask = self.animation.get_current_mask()  # Precomputed per frame
         
         # Movement
         self.speed = PLAYER_SPEED
         self.velocity_x = 0
         self.velocity_y = 0
-        self.last_update = pygame.time.get_ticks()
+        self.last_update = game.sim_time
         
         # Health properties
         self.max_health = 100
@@ -51,12 +53,13 @@ class Player(pygame.sprite.Sprite):
         self.inventory.visible = False  # Start with inventory hidden
 
     def update(self, terrain_manager, obstacles):
-        current_time = pygame.time.get_ticks()
+        current_time = self.game.sim_time
         dt = current_time - self.last_update
         self.last_update = current_time
+        self.previous_position = self.rect.topleft
         
-        # Get keyboard input
-        keys = pygame.key.get_pressed()
+        # Get this tick's input snapshot
+        keys = self.game.input
         dx = 0
         dy = 0
         
@@ -77,6 +80,11 @@ class Player(pygame.sprite.Sprite):
         self.rect.x += dx
         self.rect.y += dy
         
+        # Pick up the frame and its precomputed mask for this tick
+        self.animation.update(dt, self.direction, dx != 0 or dy != 0)
+        self.image = self.animation.get_current_frame()
+        self.mask = self.animation.get_current_mask()
+        
         # Update attack
         if self.is_attacking:
             if current_time - self.attack_timer > self.attack_duration:
@@ -92,7 +100,8 @@ class Player(pygame.sprite.Sprite):
             self.attack_cooldown -= 1
 
     def handle_collision(self, obstacles, direction):
-        for obstacle in obstacles:
+        # Only obstacles whose rect overlaps ours can collide
+        for obstacle in obstacles.query(self.rect):
             if pygame.sprite.collide_mask(self, obstacle):
                 if direction == 'x':
                     if self.velocity_x > 0:  # Moving right
@@ -110,8 +119,8 @@ class Player(pygame.sprite.Sprite):
         # Check collision with NPCs
         for npc in npcs:
             if self.rect.colliderect(npc.rect):
-                # Get keyboard input
-                keys = pygame.key.get_pressed()
+                # Get this tick's input snapshot
+                keys = self.game.input
                 if keys[pygame.K_e]:  # Press E to interact
                     npc.interact(self)
 
@@ -124,7 +133,7 @@ class Player(pygame.sprite.Sprite):
     def attack(self):
         if not self.is_attacking:
             self.is_attacking = True
-            self.attack_timer = pygame.time.get_ticks()
+            self.attack_timer = self.game.sim_time
 
     def get_attack_rect(self):
         """Get the rectangle representing the attack hitbox"""
@@ -204,17 +213,14 @@ class Inventory:
                         inventory_surface.get_rect(), 2)  # Light gray border
         
         # Draw title
-        font = pygame.font.Font(None, 36)
-        title = font.render("Inventory", True, (255, 255, 255))
-        inventory_surface.blit(title, (10, 10))
+        text_renderer.draw(inventory_surface, "Inventory", 36, (255, 255, 255), topleft=(10, 10))
         
         # Draw items
-        item_font = pygame.font.Font(None, 24)
         for i, item in enumerate(self.items):
             y_pos = 50 + i * 30
             if y_pos < 280:  # Prevent drawing outside inventory window
-                text = item_font.render(f"{item.name} x{item.quantity}", True, (255, 255, 255))
-                inventory_surface.blit(text, (20, y_pos))
+                text_renderer.draw(inventory_surface, f"{item.name} x{item.quantity}", 24, (255, 255, 255),
+                                   topleft=(20, y_pos))
         
         # Position inventory in center of screen
         screen_rect = screen.get_rect()
@@ -0,0 +1,104 @@
+import os
+import queue
+import threading
+import time
+import pygame
+from config import *
+from .assets import assets
+from .asset_cache import asset_cache
+
+def game_manifest():
+    """Every image, sprite sheet and sound the game needs before play starts"""
+    manifest = []
+    for path in (PLAYER_SPRITE_RIGHT, PLAYER_SPRITE_LEFT, PLAYER_SPRITE_UP, PLAYER_SPRITE_DOWN):
+        manifest.append(('frames', path, 93, 93))
+    for enemy_type in ('enemy1', 'enemy2'):
+        for state in ('idle', 'walk', 'attack'):
+            manifest.append(('frames', os.path.join(ENEMY_ASSETS_DIR, enemy_type, f"{state}.png"), 93, 93))
+    for path in (PLAYER_SPRITE, ENEMY1_SPRITE):
+        manifest.append(('frames', path, 64, 64))
+    for npc_type in ('merchant', 'healer', 'quest_giver'):
+        manifest.append(('packed', os.path.join(IMAGES_DIR, 'npcs', f"{npc_type}.png"), None))
+    for path in (SEA_SPRITE, DESERT_SPRITE, HELLSCAPE_SPRITE):
+        manifest.append(('image', path, (SCREEN_WIDTH, SCREEN_HEIGHT)))
+    for path in (SWORD_SWING_SOUND, HIT_SOUND, PLAYER_HURT_SOUND, ITEM_PICKUP_SOUND):
+        manifest.append(('sound', path))
+    return manifest
+
+class AssetPreloader:
+    """Loads a manifest of assets in the background while the menu is up.
+    
+    A worker thread reads and decodes the files (or maps them from the
+    on-disk asset cache). Work that needs the
+    display (convert_alpha, slicing sheets into the atlas) happens on the
+    main thread in step(), a few milliseconds per frame, and the results
+    are installed into the shared asset manager.
+    
+    Manifest entries are ('image', path, size), ('packed', path, size),
+    ('frames', path, frame_width, frame_height) or ('sound', path).
+    """
+    def __init__(self, manifest, manager=assets):
+        self.manifest = manifest
+        self.assets = manager
+        self.decoded = queue.Queue()  # (entry, result, error) from the worker
+        self.total = len(manifest)
+        self.completed = 0
+        self.thread = None
+    
+    @property
+    def done(self):
+        return self.completed >= self.total
+    
+    @property
+    def progress(self):
+        return self.completed / self.total if self.total else 1.0
+    
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.decode_all, name="asset-preloader", daemon=True)
+            self.thread.start()
+    
+    def decode_all(self):
+        for entry in self.manifest:
+            kind, path = entry[0], entry[1]
+            try:
+                if kind == 'sound':
+                    result = pygame.mixer.Sound(path)
+                elif kind == 'frames':
+                    result = asset_cache.load_image(path)
+                else:
+                    result = asset_cache.load_image(path, entry[2])
+                self.decoded.put((entry, result, None))
+            except (pygame.error, FileNotFoundError) as e:
+                self.decoded.put((entry, None, str(e)))
+    
+    def step(self, budget_ms=PRELOAD_SLICE_MS):
+        """Install decoded assets on the main thread for up to budget_ms"""
+        deadline = time.perf_counter() + budget_ms / 1000.0
+        while not self.done and time.perf_counter() < deadline:
+            try:
+                item = self.decoded.get_nowait()
+            except queue.Empty:
+                return
+            self.install(*item)
+    
+    def finish(self):
+        """Block until every manifest entry has been installed"""
+        self.start()
+        while not self.done:
+            self.install(*self.decoded.get())
+    
+    def install(self, entry, result, error):
+        kind, path = entry[0], entry[1]
+        if error is not None:
+            self.assets.install_missing(path, error)
+        elif kind == 'sound':
+            self.assets.install_sound(path, result)
+        elif kind == 'frames':
+            self.assets.install_image(path, result)
+            self.assets.load_frames(path, entry[2], entry[3])
+        else:
+            self.assets.install_image(path, result, entry[2])
+            if kind == 'packed':
+                self.assets.load_image(path, entry[2], packed=True)
+        self.completed += 1
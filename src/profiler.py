@@ -0,0 +1,147 @@
+import csv
+import json
+import time
+from array import array
+from config import *
+
+class PhaseTimer:
+    """Context manager that records the duration of one named phase"""
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+    
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        elapsed_ms = (time.perf_counter() - self.start) * 1000.0
+        self.profiler.record(self.name, elapsed_ms)
+        return False
+
+class NullTimer:
+    """Stand-in used while the profiler is disabled"""
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+class Profiler:
+    """Per-phase frame timings (in milliseconds) kept in a fixed-size ring buffer.
+    
+    Phases record into the frame in progress; end_frame() commits that frame
+    to the ring, overwriting the oldest one once the buffer is full.
+    """
+    def __init__(self, capacity=PROFILER_HISTORY, enabled=False, hitch_ms=PROFILER_HITCH_MS):
+        self.capacity = capacity
+        self.enabled = enabled
+        self.hitch_ms = hitch_ms
+        self.timers = {}
+        self.null_timer = NullTimer()
+        self.reset()
+    
+    def reset(self):
+        self.frame_times = array('d', [0.0] * self.capacity)
+        self.phases = {}  # Phase name -> ring of per-frame milliseconds
+        self.current = {}  # Phase totals for the frame in progress
+        self.index = 0  # Ring slot the next frame is written to
+        self.count = 0
+        self.total_frames = 0
+        self.hitches = 0
+    
+    def phase(self, name):
+        """Return a context manager that times the named phase"""
+        if not self.enabled:
+            return self.null_timer
+        timer = self.timers.get(name)
+        if timer is None:
+            timer = self.timers[name] = PhaseTimer(self, name)
+        return timer
+    
+    def record(self, name, elapsed_ms):
+        # A phase can run several times per frame (e.g. catch-up ticks)
+        self.current[name] = self.current.get(name, 0.0) + elapsed_ms
+    
+    def end_frame(self, frame_ms):
+        """Commit the frame in progress to the ring buffer"""
+        if not self.enabled:
+            return
+        index = self.index
+        for name, ring in self.phases.items():
+            ring[index] = self.current.pop(name, 0.0)
+        for name, elapsed_ms in self.current.items():
+            ring = self.phases[name] = array('d', [0.0] * self.capacity)
+            ring[index] = elapsed_ms
+        self.current.clear()
+        
+        self.frame_times[index] = frame_ms
+        if frame_ms > self.hitch_ms:
+            self.hitches += 1
+        
+        self.index = (index + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+        self.total_frames += 1
+    
+    def history(self, ring):
+        """Return a ring's recorded values, oldest first"""
+        if self.count < self.capacity:
+            return list(ring[:self.count])
+        return list(ring[self.index:]) + list(ring[:self.index])
+    
+    def frame_history(self):
+        return self.history(self.frame_times)
+    
+    def phase_history(self, name):
+        return self.history(self.phases[name])
+    
+    def summary(self):
+        """Return mean/p50/p95/p99 for frame time and every recorded phase"""
+        stats = {'frame': summarize(self.frame_history())}
+        for name in self.phases:
+            stats[name] = summarize(self.phase_history(name))
+        return stats
+    
+    def dump_json(self, path):
+        report = {
+            'frames': self.count,
+            'total_frames': self.total_frames,
+            'hitches': self.hitches,
+            'hitch_ms': self.hitch_ms,
+            'summary': self.summary(),
+            'history': {
+                'frame_ms': self.frame_history(),
+                **{name: self.phase_history(name) for name in self.phases}
+            }
+        }
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=2)
+    
+    def dump_csv(self, path):
+        names = list(self.phases)
+        columns = [self.frame_history()] + [self.phase_history(name) for name in names]
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['frame', 'frame_ms'] + names)
+            for i, row in enumerate(zip(*columns)):
+                writer.writerow([i] + [f"{value:.4f}" for value in row])
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * (len(sorted_values) - 1)))))
+    return sorted_values[index]
+
+def summarize(values):
+    ordered = sorted(values)
+    count = len(ordered)
+    return {
+        'count': count,
+        'mean_ms': sum(ordered) / count if count else 0.0,
+        'p50_ms': percentile(ordered, 0.50),
+        'p95_ms': percentile(ordered, 0.95),
+        'p99_ms': percentile(ordered, 0.99),
+        'max_ms': ordered[-1] if count else 0.0
+    }
@@ -0,0 +1,88 @@
+import struct
+from config import *
+from .input_state import TRACKED_KEYS
+
+# File layout: header, then run-length encoded (ticks, held, pressed) records
+REPLAY_MAGIC = b'MZRP'
+REPLAY_VERSION = 1
+HEADER_FORMAT = '<4sHHQH'  # magic, version, tick rate, RNG seed, tracked key count
+RUN_FORMAT = '<IHH'  # ticks in run, held bitmask, pressed bitmask
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+RUN_SIZE = struct.calcsize(RUN_FORMAT)
+
+class ReplayError(Exception):
+    pass
+
+class InputRecorder:
+    """Writes one input snapshot per tick, plus the RNG seed, to a compact binary file"""
+    def __init__(self, path, seed):
+        self.path = path
+        self.seed = seed
+        self.ticks = 0
+        self.run_snapshot = None
+        self.run_length = 0
+        self.file = open(path, 'wb')
+        self.file.write(struct.pack(
+            HEADER_FORMAT, REPLAY_MAGIC, REPLAY_VERSION, TICK_RATE, seed, len(TRACKED_KEYS)
+        ))
+    
+    def record(self, held, pressed):
+        snapshot = (held, pressed)
+        if snapshot == self.run_snapshot:
+            self.run_length += 1
+        else:
+            self.flush_run()
+            self.run_snapshot = snapshot
+            self.run_length = 1
+        self.ticks += 1
+    
+    def flush_run(self):
+        if self.run_length:
+            self.file.write(struct.pack(RUN_FORMAT, self.run_length, *self.run_snapshot))
+            self.run_length = 0
+    
+    def close(self):
+        if self.file.closed:
+            return
+        self.flush_run()
+        self.file.close()
+
+class InputReplayer:
+    """Feeds recorded snapshots back to InputState one tick at a time"""
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            data = f.read()
+        
+        if len(data) < HEADER_SIZE:
+            raise ReplayError(f"{path} is too short to be a replay")
+        magic, version, tick_rate, seed, key_count = struct.unpack_from(HEADER_FORMAT, data)
+        if magic != REPLAY_MAGIC or version != REPLAY_VERSION:
+            raise ReplayError(f"{path} is not a version {REPLAY_VERSION} replay")
+        if tick_rate != TICK_RATE or key_count != len(TRACKED_KEYS):
+            raise ReplayError(
+                f"{path} was recorded at {tick_rate} Hz with {key_count} keys, "
+                f"expected {TICK_RATE} Hz with {len(TRACKED_KEYS)} keys"
+            )
+        
+        self.seed = seed
+        self.runs = [
+            (length, (held, pressed))
+            for length, held, pressed in struct.iter_unpack(RUN_FORMAT, data[HEADER_SIZE:])
+        ]
+        self.total_ticks = sum(length for length, _ in self.runs)
+        self.ticks_played = 0
+        self.run_index = 0
+        self.run_remaining = self.runs[0][0] if self.runs else 0
+    
+    def next_snapshot(self):
+        """Return the next (held, pressed) snapshot, or None once the replay is over"""
+        while self.run_remaining == 0:
+            self.run_index += 1
+            if self.run_index >= len(self.runs):
+                return None
+            self.run_remaining = self.runs[self.run_index][0]
+        
+        self.run_remaining -= 1
+        self.ticks_played += 1
+        return self.runs[self.run_index][1]
@@ -1,5 +1,6 @@
 import pygame
 from config import *
+from .assets import assets
 import os
 
 class SoundManager:
@@ -12,10 +13,10 @@ class SoundManager:
     def load_sounds(self):
         try:
             self.sounds = {
-                'sword_swing': pygame.mixer.Sound(os.path.join(SOUNDS_DIR, 'sword_swing.wav')),
-                'hit': pygame.mixer.Sound(os.path.join(SOUNDS_DIR, 'hit.wav')),
-                'player_hurt': pygame.mixer.Sound(os.path.join(SOUNDS_DIR, 'player_hurt.wav')),
-                'item_pickup': pygame.mixer.Sound(os.path.join(SOUNDS_DIR, 'item_pickup.wav'))
+                'sword_swing': assets.load_sound(os.path.join(SOUNDS_DIR, 'sword_swing.wav')),
+                'hit': assets.load_sound(os.path.join(SOUNDS_DIR, 'hit.wav')),
+                'player_hurt': assets.load_sound(os.path.join(SOUNDS_DIR, 'player_hurt.wav')),
+                'item_pickup': assets.load_sound(os.path.join(SOUNDS_DIR, 'item_pickup.wav'))
             }
             
             # Set default volumes
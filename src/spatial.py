@@ -0,0 +1,136 @@
+import pygame
+import numpy as np
+from config import *
+
+class SpatialHash:
+    """Uniform grid that buckets objects by the cells their rect overlaps.
+    
+    Objects must expose a `rect`. Queries return only objects whose rect
+    actually intersects the query rect, so callers can go straight to
+    their precise (e.g. mask) test. Buckets are insertion-ordered dicts
+    rather than sets so query results come back in a reproducible order.
+    """
+    def __init__(self, cell_size=CHUNK_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}  # (cell_x, cell_y) -> {object: None}
+        self.object_cells = {}  # object -> (min_x, min_y, max_x, max_y) cell range
+    
+    def cell_range(self, rect):
+        size = self.cell_size
+        return (
+            rect.left // size,
+            rect.top // size,
+            (rect.right - 1) // size,
+            (rect.bottom - 1) // size
+        )
+    
+    def insert(self, obj, rect):
+        cell_range = self.cell_range(rect)
+        self.object_cells[obj] = cell_range
+        min_x, min_y, max_x, max_y = cell_range
+        cells = self.cells
+        for cell_x in range(min_x, max_x + 1):
+            for cell_y in range(min_y, max_y + 1):
+                bucket = cells.get((cell_x, cell_y))
+                if bucket is None:
+                    bucket = cells[(cell_x, cell_y)] = {}
+                bucket[obj] = None
+    
+    def remove(self, obj):
+        cell_range = self.object_cells.pop(obj, None)
+        if cell_range is None:
+            return
+        min_x, min_y, max_x, max_y = cell_range
+        cells = self.cells
+        for cell_x in range(min_x, max_x + 1):
+            for cell_y in range(min_y, max_y + 1):
+                bucket = cells.get((cell_x, cell_y))
+                if bucket is not None:
+                    bucket.pop(obj, None)
+                    if not bucket:
+                        del cells[(cell_x, cell_y)]
+    
+    def update(self, obj, rect):
+        """Re-bucket an object that moved; a no-op while it stays in the same cells"""
+        if self.object_cells.get(obj) == self.cell_range(rect):
+            return
+        self.remove(obj)
+        self.insert(obj, rect)
+    
+    def query(self, rect):
+        """Return the objects whose rect intersects the given rect"""
+        min_x, min_y, max_x, max_y = self.cell_range(rect)
+        cells = self.cells
+        if min_x == max_x and min_y == max_y:
+            candidates = cells.get((min_x, min_y), ())
+        else:
+            candidates = {}
+            for cell_x in range(min_x, max_x + 1):
+                for cell_y in range(min_y, max_y + 1):
+                    bucket = cells.get((cell_x, cell_y))
+                    if bucket:
+                        candidates.update(bucket)
+        colliderect = rect.colliderect
+        return [obj for obj in candidates if colliderect(obj.rect)]
+    
+    def clear(self):
+        self.cells.clear()
+        self.object_cells.clear()
+
+class SpatialGroup(pygame.sprite.Group):
+    """Sprite group that keeps a SpatialHash of its members in sync.
+    
+    Adding or removing sprites (including empty() and Sprite.kill()) updates
+    the hash. Sprites that move must be passed to reposition() afterwards.
+    """
+    def __init__(self, *sprites, cell_size=CHUNK_SIZE):
+        self.grid = SpatialHash(cell_size)
+        super().__init__(*sprites)
+    
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite)
+        self.grid.insert(sprite, sprite.rect)
+    
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        self.grid.remove(sprite)
+    
+    def reposition(self, sprite):
+        self.grid.update(sprite, sprite.rect)
+    
+    def query(self, rect):
+        """Return member sprites whose rect intersects the given rect"""
+        return self.grid.query(rect)
+    
+    def may_overlap(self, left, top, right, bottom, cell_size=COLLISION_CELL_SIZE):
+        """Vectorized broad-phase over arrays of rect edges.
+        
+        Returns False for every rect that certainly misses all members. True
+        only means the rect shares an occupancy cell with a member, so follow
+        up with query(). Members are rasterized into a grid over the rects'
+        bounding box, and each rect is tested with a summed-area table.
+        """
+        if not len(left):
+            return np.zeros(0, dtype=bool)
+        origin_x = int(left.min()) // cell_size
+        origin_y = int(top.min()) // cell_size
+        columns = (int(right.max()) - 1) // cell_size - origin_x + 1
+        rows = (int(bottom.max()) - 1) // cell_size - origin_y + 1
+        bounds = pygame.Rect(origin_x * cell_size, origin_y * cell_size, columns * cell_size, rows * cell_size)
+        members = self.query(bounds)
+        if not members:
+            return np.zeros(len(left), dtype=bool)
+        
+        occupied = np.zeros((rows, columns), dtype=bool)
+        for member in members:
+            rect = member.rect
+            occupied[max(rect.top // cell_size - origin_y, 0):(rect.bottom - 1) // cell_size - origin_y + 1,
+                     max(rect.left // cell_size - origin_x, 0):(rect.right - 1) // cell_size - origin_x + 1] = True
+        table = np.zeros((rows + 1, columns + 1), dtype=np.int32)
+        table[1:, 1:] = occupied.cumsum(axis=0).cumsum(axis=1)
+        
+        x0 = left // cell_size - origin_x
+        y0 = top // cell_size - origin_y
+        x1 = (right - 1) // cell_size - origin_x + 1
+        y1 = (bottom - 1) // cell_size - origin_y + 1
+        return table[y1, x1] - table[y0, x1] - table[y1, x0] + table[y0, x0] > 0
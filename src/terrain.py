@@ -1,74 +1,360 @@
+import math
+import queue
+import threading
+import numpy as np
 import pygame
 import random
+from collections import OrderedDict
 from config import *
+from .spatial import SpatialGroup
+from .assets import assets
 
 class TerrainObstacle(pygame.sprite.Sprite):
     def __init__(self, x, y, width, height):
         super().__init__()
-        self.image = pygame.Surface((width, height))
-        self.image.fill((100, 100, 100))  # Gray color for obstacles
+        # Obstacles are flat gray, so they all share one atlas tile
+        tile = assets.get_or_create('obstacle_tile', lambda: assets.pack(self.create_image(150, 150)))
+        if width <= tile.get_width() and height <= tile.get_height():
+            self.image = tile.subsurface((0, 0, width, height))
+        else:
+            self.image = self.create_image(width, height)
         self.rect = self.image.get_rect()
         self.rect.x = x
         self.rect.y = y
         self.mask = pygame.mask.from_surface(self.image)
+    
+    def create_image(self, width, height):
+        image = pygame.Surface((width, height))
+        image.fill((100, 100, 100))  # Gray color for obstacles
+        return image
+
+class ObstacleGroup(SpatialGroup):
+    """Spatial group that reports every added or removed obstacle's rect"""
+    def __init__(self, on_change, *sprites):
+        self.on_change = on_change
+        super().__init__(*sprites)
+    
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite)
+        self.on_change(sprite.rect)
+    
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        self.on_change(sprite.rect)
+
+def lattice_value(seed, ix, iy):
+    """Deterministic pseudo-random value in [0, 1] for an integer lattice point"""
+    h = (ix * 374761393 + iy * 668265263 + seed * 2246822519) & 0xFFFFFFFF
+    h = ((h ^ (h >> 13)) * 1274126177) & 0xFFFFFFFF
+    return (h ^ (h >> 16)) / 0xFFFFFFFF
+
+def value_noise(seed, x, y):
+    """Smoothly interpolated lattice noise in [0, 1]"""
+    ix = math.floor(x)
+    iy = math.floor(y)
+    fx = x - ix
+    fy = y - iy
+    fx = fx * fx * (3 - 2 * fx)
+    fy = fy * fy * (3 - 2 * fy)
+    top = lattice_value(seed, ix, iy) + (lattice_value(seed, ix + 1, iy) - lattice_value(seed, ix, iy)) * fx
+    bottom = lattice_value(seed, ix, iy + 1) + (lattice_value(seed, ix + 1, iy + 1) - lattice_value(seed, ix, iy + 1)) * fx
+    return top + (bottom - top) * fy
+
+def terrain_type_at_chunk(seed, chunk_x, chunk_y):
+    """Terrain type of a chunk, from two octaves of value noise"""
+    x = chunk_x / TERRAIN_NOISE_SCALE
+    y = chunk_y / TERRAIN_NOISE_SCALE
+    n = (value_noise(seed, x, y) * 2 + value_noise(seed + 1, x * 2, y * 2)) / 3
+    for limit, terrain_type in TERRAIN_BANDS:
+        if n < limit:
+            return terrain_type
+    return TERRAIN_BANDS[-1][1]
+
+def lattice_values(seed, ix, iy):
+    """lattice_value() over int64 arrays; uint64 wraparound keeps the low 32 bits identical"""
+    mask = np.uint64(0xFFFFFFFF)
+    h = (ix.astype(np.uint64) * np.uint64(374761393) + iy.astype(np.uint64) * np.uint64(668265263)
+         + np.uint64(seed * 2246822519 & 0xFFFFFFFF)) & mask
+    h = ((h ^ (h >> np.uint64(13))) * np.uint64(1274126177)) & mask
+    return (h ^ (h >> np.uint64(16))) / 0xFFFFFFFF
+
+def value_noise_array(seed, x, y):
+    """value_noise() over float64 arrays, evaluated in the same order so results match exactly"""
+    ix = np.floor(x)
+    iy = np.floor(y)
+    fx = x - ix
+    fy = y - iy
+    fx = fx * fx * (3 - 2 * fx)
+    fy = fy * fy * (3 - 2 * fy)
+    ix = ix.astype(np.int64)
+    iy = iy.astype(np.int64)
+    top_left = lattice_values(seed, ix, iy)
+    bottom_left = lattice_values(seed, ix, iy + 1)
+    top = top_left + (lattice_values(seed, ix + 1, iy) - top_left) * fx
+    bottom = bottom_left + (lattice_values(seed, ix + 1, iy + 1) - bottom_left) * fx
+    return top + (bottom - top) * fy
+
+def terrain_codes_at_chunks(seed, chunk_x, chunk_y):
+    """terrain_type_at_chunk() for arrays of chunk coordinates, as TERRAIN_TYPES indices"""
+    x = chunk_x / TERRAIN_NOISE_SCALE
+    y = chunk_y / TERRAIN_NOISE_SCALE
+    n = (value_noise_array(seed, x, y) * 2 + value_noise_array(seed + 1, x * 2, y * 2)) / 3
+    band = np.minimum(np.searchsorted(BAND_LIMITS, n, side='right'), len(BAND_CODES) - 1)
+    return BAND_CODES[band]
+
+# Terrain types as uint8 codes, and the movement penalty of each code
+TERRAIN_CODES = {terrain_type: code for code, terrain_type in enumerate(TERRAIN_TYPES)}
+TERRAIN_PENALTIES = np.array([TERRAIN_MOVEMENT_PENALTIES.get(terrain_type, 1.0) for terrain_type in TERRAIN_TYPES],
+                             dtype=np.float32)
+BAND_LIMITS = np.array([limit for limit, _ in TERRAIN_BANDS])
+BAND_CODES = np.array([TERRAIN_CODES[terrain_type] for _, terrain_type in TERRAIN_BANDS], dtype=np.uint8)
+
+class TerrainGrid:
+    """Dense terrain types (uint8) and movement penalties (float32) for a square of chunks.
+    
+    The window follows the streamed area; positions outside it fall back to
+    evaluating the noise directly, so lookups are valid anywhere in the world.
+    Arrays are indexed [chunk_x, chunk_y] relative to the window origin.
+    """
+    def __init__(self, seed, radius):
+        self.seed = seed
+        self.radius = radius
+        size = radius * 2 + 1
+        self.origin = (0, 0)  # World chunk coordinate of cell [0, 0]
+        self.types = np.zeros((size, size), dtype=np.uint8)
+        self.penalties = np.ones((size, size), dtype=np.float32)
+    
+    def rebuild(self, center):
+        """Re-center the window on a chunk"""
+        radius = self.radius
+        origin_x = center[0] - radius
+        origin_y = center[1] - radius
+        size = radius * 2 + 1
+        chunk_x, chunk_y = np.mgrid[origin_x:origin_x + size, origin_y:origin_y + size]
+        self.origin = (origin_x, origin_y)
+        self.types = terrain_codes_at_chunks(self.seed, chunk_x, chunk_y)
+        self.penalties = TERRAIN_PENALTIES[self.types]
+    
+    def codes_at(self, xs, ys):
+        """Terrain codes at arrays of world positions"""
+        chunk_x = np.floor_divide(xs, CHUNK_SIZE).astype(np.int64)
+        chunk_y = np.floor_divide(ys, CHUNK_SIZE).astype(np.int64)
+        local_x = chunk_x - self.origin[0]
+        local_y = chunk_y - self.origin[1]
+        size = self.types.shape[0]
+        inside = (local_x >= 0) & (local_x < size) & (local_y >= 0) & (local_y < size)
+        if inside.all():
+            return self.types[local_x, local_y]
+        codes = np.empty(len(chunk_x), dtype=np.uint8)
+        codes[inside] = self.types[local_x[inside], local_y[inside]]
+        outside = ~inside
+        codes[outside] = terrain_codes_at_chunks(self.seed, chunk_x[outside], chunk_y[outside])
+        return codes
+    
+    def penalties_at(self, xs, ys):
+        """Movement penalties at arrays of world positions, in one vectorized pass"""
+        return TERRAIN_PENALTIES[self.codes_at(xs, ys)]
+
+def generate_chunk(seed, chunk_x, chunk_y):
+    """Terrain type and obstacle rects (x, y, w, h) for one chunk.
+    
+    A pure function of the seed and chunk coordinate, so a chunk comes out
+    the same whether it's generated on the worker thread or the main thread,
+    and in whatever order chunks are visited.
+    """
+    terrain_type = terrain_type_at_chunk(seed, chunk_x, chunk_y)
+    rng = random.Random((seed * 1000003 + chunk_x) * 1000003 + chunk_y)
+    obstacles = []
+    if rng.random() < TERRAIN_OBSTACLE_CHANCE.get(terrain_type, 0.0):
+        x = chunk_x * CHUNK_SIZE + rng.randrange(CHUNK_SIZE)
+        y = chunk_y * CHUNK_SIZE + rng.randrange(CHUNK_SIZE)
+        obstacles.append((x, y, rng.randint(50, 150), rng.randint(50, 150)))
+    return terrain_type, obstacles
+
+class WorldChunk:
+    """A loaded chunk: its terrain type and the obstacle sprites it owns"""
+    def __init__(self, terrain_type, obstacles):
+        self.terrain_type = terrain_type
+        self.obstacles = obstacles
 
 class TerrainManager:
-    def __init__(self):
-        self.terrain_map = {}
-        self.obstacles = pygame.sprite.Group()
-        self.generate_terrain()
-        self.generate_obstacles()
+    """Streams an unbounded, seeded world in CHUNK_SIZE chunks.
+    
+    update() loads every chunk within TERRAIN_ACTIVE_RADIUS of the player on
+    the main thread, so which obstacles exist on a given tick depends only on
+    the seed and the player's path, never on thread timing. Chunks in the
+    ring out to TERRAIN_PREFETCH_RADIUS are generated ahead of time on a
+    worker thread and adopted once they come into range. Loaded chunks live
+    in an LRU capped at TERRAIN_CHUNK_CACHE; evicting a chunk removes its
+    obstacles, so memory stays flat however far the player travels.
+    """
+    def __init__(self, seed=0, prefetch=True):
+        self.seed = seed
+        self.chunks = OrderedDict()  # (chunk_x, chunk_y) -> WorldChunk, least recently in range first
+        self.center = None  # Chunk the active area was last built around
+        self.grid = TerrainGrid(seed, TERRAIN_ACTIVE_RADIUS)
+        
+        # Ground and obstacles baked into TERRAIN_BAKE_SIZE tiles, least recently drawn first
+        self.chunk_cache = OrderedDict()  # (tile_x, tile_y) -> Surface
+        self.bakes = 0
+        
+        # Static obstacles, bucketed for collision queries; changes invalidate baked tiles
+        self.obstacles = ObstacleGroup(self.invalidate)
+        
+        # Chunk generation ahead of the player
+        self.prefetched = {}  # (chunk_x, chunk_y) -> generate_chunk() result
+        self.pending = set()
+        self.requests = queue.Queue()
+        self.generated = queue.Queue()
+        self.thread = None
+        if prefetch:
+            self.thread = threading.Thread(target=self.prefetch_worker, name="terrain-prefetch", daemon=True)
+            self.thread.start()
+    
+    def prefetch_worker(self):
+        while True:
+            key = self.requests.get()
+            if key is None:
+                return
+            self.generated.put((key, generate_chunk(self.seed, *key)))
+    
+    def close(self):
+        """Stop the prefetch thread"""
+        if self.thread is not None:
+            self.requests.put(None)
+            self.thread = None
+    
+    def update(self, position):
+        """Stream chunks around a world position; cheap until it crosses into another chunk"""
+        center = (int(position[0] // CHUNK_SIZE), int(position[1] // CHUNK_SIZE))
+        if center == self.center:
+            return
+        self.center = center
+        self.grid.rebuild(center)
+        self.collect_prefetched()
+        
+        # Load (or refresh) everything in the active area
+        center_x, center_y = center
+        radius = TERRAIN_ACTIVE_RADIUS
+        chunks = self.chunks
+        for chunk_x in range(center_x - radius, center_x + radius + 1):
+            for chunk_y in range(center_y - radius, center_y + radius + 1):
+                key = (chunk_x, chunk_y)
+                if key in chunks:
+                    chunks.move_to_end(key)
+                else:
+                    self.load_chunk(key)
         
-    def generate_terrain(self):
-        """Generate simple terrain"""
-        for x in range(-10, 11):
-            for y in range(-10, 11):
-                self.terrain_map[(x, y)] = 'sea'
-    
-    def generate_obstacles(self):
-        """Generate random obstacles"""
-        # Clear existing obstacles
-        self.obstacles.empty()
+        # Everything still in range was just refreshed, so only distant chunks go
+        while len(chunks) > max(TERRAIN_CHUNK_CACHE, (radius * 2 + 1) ** 2):
+            key, chunk = chunks.popitem(last=False)
+            self.obstacles.remove(*chunk.obstacles)
         
-        # Generate new obstacles
-        for _ in range(20):  # Generate 20 random obstacles
-            x = random.randint(-1000, 1000)
-            y = random.randint(-1000, 1000)
-            width = random.randint(50, 150)
-            height = random.randint(50, 150)
-            
-            obstacle = TerrainObstacle(x, y, width, height)
-            self.obstacles.add(obstacle)
+        if self.thread is not None:
+            self.request_prefetch(center)
+    
+    def load_chunk(self, key):
+        data = self.prefetched.pop(key, None)
+        if data is None:
+            data = generate_chunk(self.seed, *key)
+        terrain_type, rects = data
+        obstacles = [TerrainObstacle(*rect) for rect in rects]
+        self.chunks[key] = WorldChunk(terrain_type, obstacles)
+        self.obstacles.add(*obstacles)
+    
+    def request_prefetch(self, center):
+        """Queue generation of the not-yet-loaded chunks in the prefetch ring"""
+        center_x, center_y = center
+        radius = TERRAIN_PREFETCH_RADIUS
+        wanted = set()
+        for chunk_x in range(center_x - radius, center_x + radius + 1):
+            for chunk_y in range(center_y - radius, center_y + radius + 1):
+                key = (chunk_x, chunk_y)
+                if key not in self.chunks:
+                    wanted.add(key)
+        
+        # Results the player has moved away from are dropped, keeping the buffer bounded
+        for key in [key for key in self.prefetched if key not in wanted]:
+            del self.prefetched[key]
+        for key in sorted(wanted - self.pending - self.prefetched.keys()):
+            self.pending.add(key)
+            self.requests.put(key)
+    
+    def collect_prefetched(self):
+        while True:
+            try:
+                key, data = self.generated.get_nowait()
+            except queue.Empty:
+                return
+            self.pending.discard(key)
+            self.prefetched[key] = data
     
     def get_terrain_at_position(self, x, y):
         """Get terrain type at world position"""
-        chunk_x = int(x // CHUNK_SIZE)
-        chunk_y = int(y // CHUNK_SIZE)
-        return self.terrain_map.get((chunk_x, chunk_y), 'sea')
+        key = (int(x // CHUNK_SIZE), int(y // CHUNK_SIZE))
+        chunk = self.chunks.get(key)
+        if chunk is not None:
+            return chunk.terrain_type
+        return terrain_type_at_chunk(self.seed, *key)
     
-    def draw(self, screen, camera):
-        """Draw terrain and obstacles"""
-        # Draw terrain chunks
-        cam_x = -camera.camera.x
-        cam_y = -camera.camera.y
+    def penalties_at(self, xs, ys):
+        """Terrain movement penalties for arrays of world x/y positions"""
+        return self.grid.penalties_at(xs, ys)
+    
+    def invalidate(self, rect):
+        """Drop the baked tiles overlapping a world rect so they're rebuilt on next draw"""
+        size = TERRAIN_BAKE_SIZE
+        for tile_x in range(rect.left // size, (rect.right - 1) // size + 1):
+            for tile_y in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                self.chunk_cache.pop((tile_x, tile_y), None)
+    
+    def bake_tile(self, tile_x, tile_y):
+        """Render one tile of terrain chunks plus the obstacles overlapping it"""
+        size = TERRAIN_BAKE_SIZE
+        origin_x = tile_x * size
+        origin_y = tile_y * size
+        surface = pygame.Surface((size, size))
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
         
-        start_x = int((cam_x - CHUNK_SIZE) // CHUNK_SIZE)
-        end_x = int((cam_x + SCREEN_WIDTH + CHUNK_SIZE) // CHUNK_SIZE)
-        start_y = int((cam_y - CHUNK_SIZE) // CHUNK_SIZE)
-        end_y = int((cam_y + SCREEN_HEIGHT + CHUNK_SIZE) // CHUNK_SIZE)
+        # Terrain chunks
+        for x in range(0, size, CHUNK_SIZE):
+            for y in range(0, size, CHUNK_SIZE):
+                terrain_type = self.get_terrain_at_position(origin_x + x, origin_y + y)
+                pygame.draw.rect(surface, TERRAIN_COLORS[terrain_type], (x, y, CHUNK_SIZE, CHUNK_SIZE))
+                pygame.draw.rect(surface, (255, 255, 255), (x, y, CHUNK_SIZE, CHUNK_SIZE), 1)
+        
+        # Obstacles, clipped to the tile
+        area = pygame.Rect(origin_x, origin_y, size, size)
+        surface.blits([
+            (obstacle.image, (obstacle.rect.x - origin_x, obstacle.rect.y - origin_y))
+            for obstacle in self.obstacles.query(area)
+        ], doreturn=False)
+        
+        self.bakes += 1
+        return surface
+    
+    def draw(self, screen, camera):
+        """Draw terrain and obstacles from the baked tile cache"""
+        size = TERRAIN_BAKE_SIZE
+        offset_x, offset_y = camera.offset
+        cam_x = -offset_x
+        cam_y = -offset_y
+        width, height = screen.get_size()
         
-        # Draw terrain
-        for x in range(start_x, end_x + 1):
-            for y in range(start_y, end_y + 1):
-                screen_x = x * CHUNK_SIZE + camera.camera.x
-                screen_y = y * CHUNK_SIZE + camera.camera.y
-                pygame.draw.rect(screen, (0, 0, 255), 
-                               (screen_x, screen_y, CHUNK_SIZE, CHUNK_SIZE))
-                pygame.draw.rect(screen, (255, 255, 255), 
-                               (screen_x, screen_y, CHUNK_SIZE, CHUNK_SIZE), 1)
+        cache = self.chunk_cache
+        batch = []
+        for tile_x in range(cam_x // size, (cam_x + width - 1) // size + 1):
+            for tile_y in range(cam_y // size, (cam_y + height - 1) // size + 1):
+                key = (tile_x, tile_y)
+                surface = cache.get(key)
+                if surface is None:
+                    surface = cache[key] = self.bake_tile(tile_x, tile_y)
+                else:
+                    cache.move_to_end(key)
+                batch.append((surface, (tile_x * size + offset_x, tile_y * size + offset_y)))
+        screen.blits(batch, doreturn=False)
         
-        # Draw obstacles
-        for obstacle in self.obstacles:
-            screen_pos = camera.apply(obstacle)
-            if screen.get_rect().colliderect(screen_pos):
-                screen.blit(obstacle.image, screen_pos)
\ No newline at end of file
+        # Tiles drawn this frame are the most recent, so eviction only takes off-screen ones
+        while len(cache) > TERRAIN_CACHE_SIZE:
+            cache.popitem(last=False)
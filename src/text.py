@@ -0,0 +1,80 @@
+from collections import OrderedDict
+import pygame
+from config import *
+from .atlas import TextureAtlas, source
+
+class TextRenderer:
+    """Shared text drawing for the HUD and menus.
+    
+    Keeps one Font per size and renders each glyph once per (size, color)
+    into a glyph atlas. Strings are composed from those glyphs with a single
+    Surface.blits() call, and the composed surfaces are kept in an LRU keyed
+    by (text, size, color), so unchanged text costs one dict lookup.
+    """
+    def __init__(self, capacity=TEXT_CACHE_SIZE):
+        self.capacity = capacity
+        self.fonts = {}  # size -> Font
+        self.glyphs = {}  # (char, size, color) -> (page, area)
+        self.atlas = TextureAtlas(TEXT_ATLAS_PAGE_SIZE, padding=1)
+        self.cache = OrderedDict()  # (text, size, color) -> Surface
+        self.hits = 0
+        self.misses = 0
+    
+    def font(self, size):
+        font = self.fonts.get(size)
+        if font is None:
+            font = self.fonts[size] = pygame.font.Font(None, size)
+        return font
+    
+    def render(self, text, size, color=WHITE):
+        """Return a (shared, read-only) surface with text drawn in color"""
+        key = (text, size, color)
+        surface = self.cache.get(key)
+        if surface is not None:
+            self.cache.move_to_end(key)
+            self.hits += 1
+            return surface
+        
+        self.misses += 1
+        surface = self.cache[key] = self.compose(text, size, color)
+        if len(self.cache) > self.capacity:
+            self.cache.popitem(last=False)
+        return surface
+    
+    def draw(self, target, text, size, color=WHITE, **anchor):
+        """Blit text onto target, positioned by a Rect keyword such as topleft= or center="""
+        surface = self.render(text, size, color)
+        rect = surface.get_rect(**anchor)
+        target.blit(surface, rect)
+        return rect
+    
+    def compose(self, text, size, color):
+        glyphs = [self.glyph(char, size, color) for char in text]
+        width = sum(area.width for _, area in glyphs)
+        height = max([area.height for _, area in glyphs], default=self.font(size).get_height())
+        
+        surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        batch = []
+        x = 0
+        for page, area in glyphs:
+            # MAX keeps glyph alpha intact on the transparent surface
+            batch.append((page, (x, 0), area, pygame.BLEND_RGBA_MAX))
+            x += area.width
+        surface.blits(batch, doreturn=False)
+        return surface
+    
+    def glyph(self, char, size, color):
+        key = (char, size, color)
+        glyph = self.glyphs.get(key)
+        if glyph is None:
+            page, area = source(self.atlas.add(self.font(size).render(char, True, color)))
+            glyph = self.glyphs[key] = (page, area or page.get_rect())
+        return glyph
+    
+    def clear(self):
+        self.glyphs.clear()
+        self.atlas.clear()
+        self.cache.clear()
+
+# Shared by every UI module
+text_renderer = TextRenderer()
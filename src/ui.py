@@ -1,11 +1,43 @@
+import numpy as np
 import pygame
 from config import *
+from .text import text_renderer
+
+class HudWidget:
+    """One HUD element that keeps its rendered surface until its bound value changes"""
+    def __init__(self, render, **anchor):
+        self.render = render  # value -> Surface, or None to hide the widget
+        self.anchor = anchor  # Rect keyword used to place the surface, e.g. topleft=(x, y)
+        self.value = None
+        self.surface = None
+        self.rect = None
+        self.dirty = True
+        self.renders = 0
+    
+    def bind(self, value):
+        """Set the displayed value, marking the widget dirty only if it changed"""
+        if value != self.value:
+            self.value = value
+            self.dirty = True
+    
+    def invalidate(self):
+        self.dirty = True
+    
+    def layer(self):
+        """Return (surface, rect) to composite, re-rendering first if dirty"""
+        if self.dirty:
+            self.surface = self.render(self.value)
+            self.rect = self.surface.get_rect(**self.anchor) if self.surface else None
+            self.dirty = False
+            self.renders += 1
+        return self.surface, self.rect
 
 class UI:
     def __init__(self, game):
         self.game = game
-        self.font = pygame.font.Font(None, 36)
-        self.small_font = pygame.font.Font(None, 24)
+        self.font_size = 36
+        self.small_font_size = 24
+        self.legend_font_size = 20
         
         # Health bar settings
         self.health_bar_width = 200
@@ -20,150 +52,145 @@ class UI:
         self.radar_size = 150
         self.radar_position = (20, 60)
         self.radar_scale = 0.1
+        self.radar_interval = 1000 / RADAR_REFRESH_HZ if RADAR_REFRESH_HZ else 0
+        self.radar_refreshed_at = 0
+        self.radar_base = None  # Panel, border and player dot
+        self.radar_surface = None  # Panel plus the contacts from the last refresh
+        self.radar_dot = None
         
         # Message settings
         self.message = ""
         self.message_timer = 0
         self.message_duration = 2000
+        
+        # Retained HUD layers; only the radar contacts are drawn fresh every frame
+        self.radar_frame = HudWidget(self.render_radar_frame,
+                                     topleft=(self.radar_position[0] - 4, self.radar_position[1] - 4))
+        self.radar_legend = HudWidget(self.render_radar_legend,
+                                      topleft=(self.radar_position[0], self.radar_position[1] + self.radar_size))
+        self.health_bar = HudWidget(self.render_health_bar, topleft=self.health_bar_position)
+        self.score_label = HudWidget(self.render_score, topleft=self.score_position)
+        self.message_label = HudWidget(self.render_message, center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 50))
     
     def update(self):
         # Update message timer
         if self.message_timer > 0:
-            self.message_timer -= self.game.clock.get_time()
+            self.message_timer -= TICK_MS
             if self.message_timer <= 0:
                 self.message = ""
     
     def draw(self, screen):
-        print("Drawing UI, radar status:", self.show_radar)  # Debug output
+        self.health_bar.bind(self.game.player.health)
+        self.score_label.bind(getattr(self.game, 'score', 0))
+        self.message_label.bind(self.message)
         
         # Draw radar first (so it's behind other UI elements)
+        layers = []
         if self.show_radar:
-            print("Drawing radar")  # Debug output
-            # Create radar surface
-            radar_surface = pygame.Surface((self.radar_size, self.radar_size))
-            radar_surface.fill((0, 0, 0))  # Black background
-            
-            # Draw radar border
-            pygame.draw.rect(radar_surface, (0, 255, 0), 
-                           (0, 0, self.radar_size, self.radar_size), 2)  # Green border
-            
-            # Calculate radar center
-            radar_center = (self.radar_size // 2, self.radar_size // 2)
-            
-            # Draw player position (center of radar)
-            pygame.draw.circle(radar_surface, (0, 255, 0), radar_center, 4)  # Green dot for player
-            
-            # Draw enemies on radar
-            for enemy in self.game.enemies:
-                # Calculate relative position to player
-                rel_x = enemy.rect.centerx - self.game.player.rect.centerx
-                rel_y = enemy.rect.centery - self.game.player.rect.centery
-                
-                # Scale position to radar size
-                radar_x = radar_center[0] + int(rel_x * self.radar_scale)
-                radar_y = radar_center[1] + int(rel_y * self.radar_scale)
-                
-                # Check if enemy is within radar bounds
-                if (0 <= radar_x < self.radar_size and 
-                    0 <= radar_y < self.radar_size):
-                    # Draw enemy dot
-                    pygame.draw.circle(radar_surface, (255, 0, 0), 
-                                     (radar_x, radar_y), 3)  # Red dot for enemies
-            
-            # Draw NPCs on radar
-            try:
-                for npc in self.game.npcs:  # Add NPCs to radar
-                    # Calculate relative position to player
-                    rel_x = npc.rect.centerx - self.game.player.rect.centerx
-                    rel_y = npc.rect.centery - self.game.player.rect.centery
-                    
-                    # Scale position to radar size
-                    radar_x = radar_center[0] + int(rel_x * self.radar_scale)
-                    radar_y = radar_center[1] + int(rel_y * self.radar_scale)
-                    
-                    # Check if NPC is within radar bounds
-                    if (0 <= radar_x < self.radar_size and 
-                        0 <= radar_y < self.radar_size):
-                        # Draw NPC dot (blue for NPCs)
-                        pygame.draw.circle(radar_surface, (0, 191, 255), 
-                                         (radar_x, radar_y), 3)  # Light blue dot for NPCs
-            except AttributeError:
-                pass  # Skip if game doesn't have NPCs
-            
-            # Add semi-transparent background
-            background = pygame.Surface((self.radar_size + 8, self.radar_size + 8))
-            background.fill((40, 40, 40))  # Dark gray
-            background.set_alpha(200)  # Semi-transparent
-            screen.blit(background, (self.radar_position[0] - 4, self.radar_position[1] - 4))
-            
-            # Add radar to main screen
-            screen.blit(radar_surface, self.radar_position)
-            
-            # Draw radar legend
-            legend_y = self.radar_position[1] + self.radar_size + 5
-            legend_x = self.radar_position[0]
-            legend_font = pygame.font.Font(None, 20)
-            
-            # Player legend
-            pygame.draw.circle(screen, (0, 255, 0), (legend_x + 5, legend_y), 3)
-            player_text = legend_font.render("Player", True, (255, 255, 255))
-            screen.blit(player_text, (legend_x + 15, legend_y - 5))
-            
-            # Enemy legend
-            pygame.draw.circle(screen, (255, 0, 0), (legend_x + 65, legend_y), 3)
-            enemy_text = legend_font.render("Enemy", True, (255, 255, 255))
-            screen.blit(enemy_text, (legend_x + 75, legend_y - 5))
-            
-            # NPC legend
-            pygame.draw.circle(screen, (0, 191, 255), (legend_x + 125, legend_y), 3)
-            npc_text = legend_font.render("NPC", True, (255, 255, 255))
-            screen.blit(npc_text, (legend_x + 135, legend_y - 5))
-        
-        # Draw health bar
-        self.draw_health_bar(screen)
+            screen.blit(*self.radar_frame.layer())
+            self.draw_radar_contacts(screen)
+            layers.append(self.radar_legend.layer())
         
-        # Draw score
-        self.draw_score(screen)
+        # Health bar, score and message
+        for widget in (self.health_bar, self.score_label, self.message_label):
+            surface, rect = widget.layer()
+            if surface is not None:
+                layers.append((surface, rect))
+        screen.blits(layers, doreturn=False)
+    
+    def draw_radar_contacts(self, screen):
+        # The contact layer is rebuilt at RADAR_REFRESH_HZ and reused in between
+        now = pygame.time.get_ticks()
+        if self.radar_surface is None or now - self.radar_refreshed_at >= self.radar_interval:
+            self.refresh_radar()
+            self.radar_refreshed_at = now
+        screen.blit(self.radar_surface, self.radar_position)
+    
+    def refresh_radar(self):
+        if self.radar_surface is None:
+            self.radar_surface = self.radar_panel().copy()
+            self.radar_dot = disk_offsets(3)
+        self.radar_surface.blit(self.radar_panel(), (0, 0))
         
-        # Draw message
-        if self.message:
-            self.draw_message(screen)
-    
-    def draw_health_bar(self, screen):
-        # Background
-        pygame.draw.rect(screen, (64, 64, 64), 
-                        (*self.health_bar_position, self.health_bar_width, self.health_bar_height))
+        # Only enemies in the world area the radar covers need converting, read straight from the store
+        player = self.game.player.rect.center
+        reach = int(self.radar_size / 2 / self.radar_scale) + 1
+        area = pygame.Rect(0, 0, reach * 2, reach * 2)
+        area.center = player
+        store = self.game.enemies.store
+        enemies = self.radar_coordinates(*store.centers(store.rows_in(area)), player)
+        npcs = np.array([npc.rect.center for npc in getattr(self.game, 'npcs', ())], dtype=np.int64).reshape(-1, 2)
+        npcs = self.radar_coordinates(npcs[:, 0], npcs[:, 1], player)
         
-        # Health bar
-        health_percentage = max(0, self.game.player.health / PLAYER_HEALTH)
-        current_health_width = int(self.health_bar_width * health_percentage)
+        pixels = pygame.surfarray.pixels2d(self.radar_surface)
+        stamp(pixels, enemies, self.radar_dot, self.radar_surface.map_rgb((255, 0, 0)))  # Red dots for enemies
+        stamp(pixels, npcs, self.radar_dot, self.radar_surface.map_rgb((0, 191, 255)))  # Light blue dots for NPCs
+        del pixels  # Unlock the surface
+    
+    def radar_coordinates(self, xs, ys, center):
+        """Radar-space (x, y) rows for the world positions inside the radar, in one NumPy pass"""
+        # Scale offsets from the player; int() truncation toward zero, as before
+        half = self.radar_size // 2
+        radar_x = half + ((xs - center[0]) * self.radar_scale).astype(np.int64)
+        radar_y = half + ((ys - center[1]) * self.radar_scale).astype(np.int64)
+        inside = (radar_x >= 0) & (radar_x < self.radar_size) & (radar_y >= 0) & (radar_y < self.radar_size)
+        return np.column_stack((radar_x[inside], radar_y[inside]))
+    
+    def radar_panel(self):
+        """The static radar artwork, rendered once and shared by the frame and the contact layer"""
+        if self.radar_base is None:
+            self.radar_base = self.render_radar_panel()
+        return self.radar_base
+    
+    def render_radar_panel(self):
+        panel = pygame.Surface((self.radar_size, self.radar_size))
+        if pygame.display.get_surface() is not None:
+            panel = panel.convert()
+        panel.fill((0, 0, 0))  # Black background
+        pygame.draw.rect(panel, (0, 255, 0), panel.get_rect(), 2)  # Green border
+        pygame.draw.circle(panel, (0, 255, 0), panel.get_rect().center, 4)  # Green dot for player
+        return panel
+    
+    def render_radar_frame(self, _):
+        # Semi-transparent dark gray margin around an opaque black radar
+        frame = pygame.Surface((self.radar_size + 8, self.radar_size + 8), pygame.SRCALPHA)
+        frame.fill((40, 40, 40, 200))
+        frame.blit(self.radar_panel(), (4, 4))
+        return frame
+    
+    def render_radar_legend(self, _):
+        legend = pygame.Surface((self.radar_size + 20, 20), pygame.SRCALPHA)
+        for x, label, color in ((0, "Player", (0, 255, 0)), (60, "Enemy", (255, 0, 0)), (120, "NPC", (0, 191, 255))):
+            pygame.draw.circle(legend, color, (x + 5, 5), 3)
+            legend.blit(text_renderer.render(label, self.legend_font_size, WHITE), (x + 15, 0))
+        return legend
+    
+    def render_health_bar(self, health):
+        bar = pygame.Surface((self.health_bar_width, self.health_bar_height))
+        bar.fill((64, 64, 64))  # Background
         
         # Health color (green to red based on health)
+        health_percentage = max(0, health / PLAYER_HEALTH)
         health_color = (
             int(255 * (1 - health_percentage)),  # Red
             int(255 * health_percentage),        # Green
             0                                    # Blue
         )
-        
-        pygame.draw.rect(screen, health_color,
-                        (*self.health_bar_position, current_health_width, self.health_bar_height))
+        pygame.draw.rect(bar, health_color,
+                        (0, 0, int(self.health_bar_width * health_percentage), self.health_bar_height))
         
         # Health text
-        health_text = f"HP: {self.game.player.health}/{PLAYER_HEALTH}"
-        text_surface = self.small_font.render(health_text, True, WHITE)
-        text_rect = text_surface.get_rect(midleft=(self.health_bar_position[0] + 5, 
-                                                  self.health_bar_position[1] + self.health_bar_height // 2))
-        screen.blit(text_surface, text_rect)
-    
-    def draw_score(self, screen):
-        score_text = f"Score: {getattr(self.game, 'score', 0)}"
-        text_surface = self.font.render(score_text, True, WHITE)
-        screen.blit(text_surface, self.score_position)
-    
-    def draw_message(self, screen):
-        text_surface = self.font.render(self.message, True, WHITE)
-        text_rect = text_surface.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 50))
-        screen.blit(text_surface, text_rect)
+        text_renderer.draw(bar, f"HP: {health}/{PLAYER_HEALTH}", self.small_font_size, WHITE,
+                           midleft=(5, self.health_bar_height // 2))
+        return bar
+    
+    def render_score(self, score):
+        return text_renderer.render(f"Score: {score}", self.font_size, WHITE)
+    
+    def render_message(self, message):
+        if not message:
+            return None
+        return text_renderer.render(message, self.font_size, WHITE)
     
     def show_message(self, message, duration=2000):
         """Show a message for the specified duration (in milliseconds)"""
@@ -172,13 +199,36 @@ class UI:
     
     def show_game_over(self):
         """Show game over screen"""
-        text_surface = self.font.render("Game Over", True, RED)
-        text_rect = text_surface.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
-        self.game.screen.blit(text_surface, text_rect)
-        
-        restart_text = self.small_font.render("Press SPACE to restart or ESC to quit", True, WHITE)
-        restart_rect = restart_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 50))
-        self.game.screen.blit(restart_text, restart_rect)
+        text_renderer.draw(self.game.screen, "Game Over", self.font_size, RED,
+                           center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
+        text_renderer.draw(self.game.screen, "Press SPACE to restart or ESC to quit", self.small_font_size, WHITE,
+                           center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 50))
 
     def toggle_radar(self):
-        self.show_radar = not self.show_radar 
\ No newline at end of file
+        self.show_radar = not self.show_radar 
+
+def disk_offsets(radius):
+    """Pixel offsets covered by pygame.draw.circle of the given radius"""
+    size = radius * 2 + 1
+    disk = pygame.Surface((size, size))
+    pygame.draw.circle(disk, WHITE, (radius, radius), radius)
+    xs, ys = np.nonzero(pygame.surfarray.array2d(disk))
+    return list(zip(xs - radius, ys - radius))
+
+def stamp(pixels, positions, offsets, color):
+    """Write a dot of color at every (x, y) in positions, clipped to the pixel array.
+    
+    Positions must lie inside the array. They are marked on a padded grid
+    which is then spread into dots one offset at a time, so the cost barely
+    grows with the number of positions.
+    """
+    if not len(positions):
+        return
+    width, height = pixels.shape
+    pad = max(max(abs(dx), abs(dy)) for dx, dy in offsets)
+    marks = np.zeros((width + pad * 2, height + pad * 2), dtype=bool)
+    marks[positions[:, 0] + pad, positions[:, 1] + pad] = True
+    covered = np.zeros((width, height), dtype=bool)
+    for dx, dy in offsets:
+        covered |= marks[pad - dx:pad - dx + width, pad - dy:pad - dy + height]
+    pixels[covered] = color
@@ -0,0 +1,72 @@
+"""Micro-benchmark for enemy animation frame lookups.
+
+Creates many EnemyAnimation instances (half of them facing left), then calls
+get_current_frame() on each one per simulated frame and reports the time
+per call and how many new Surfaces were allocated per frame.
+
+Usage:
+    python tools/bench_animation.py --enemies 500 --frames 300
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pygame
+from src.enemy_animation import EnemyAnimation
+
+def baked_surface_ids(animation):
+    """Ids of every Surface an animation holds on to (its baked frames)"""
+    ids = set()
+    for value in vars(animation).values():
+        if isinstance(value, dict):
+            for frames in value.values():
+                if isinstance(frames, list):
+                    ids.update(id(frame) for frame in frames if isinstance(frame, pygame.Surface))
+    return ids
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark enemy animation frame lookups")
+    parser.add_argument('--enemies', type=int, default=500)
+    parser.add_argument('--frames', type=int, default=300)
+    parser.add_argument('--seed', type=int, default=1234)
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    random.seed(args.seed)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        animations = [EnemyAnimation(random.choice(['enemy1', 'enemy2'])) for _ in range(args.enemies)]
+    for i, animation in enumerate(animations):
+        animation.facing_right = i % 2 == 0
+        animation.current_state = random.choice(['idle', 'walk', 'attack'])
+
+    baked = set()
+    for animation in animations:
+        baked |= baked_surface_ids(animation)
+
+    allocations = 0
+    start = time.perf_counter()
+    for _ in range(args.frames):
+        for animation in animations:
+            animation.update(1000 / 60, animation.current_state, True)
+            if id(animation.get_current_frame()) not in baked:
+                allocations += 1
+    elapsed = time.perf_counter() - start
+
+    calls = args.enemies * args.frames
+    print(f"enemies: {args.enemies}  frames: {args.frames}")
+    print(f"get_current_frame: {elapsed / calls * 1e6:.2f} us/call, {elapsed / args.frames * 1000:.2f} ms/frame")
+    print(f"surfaces allocated: {allocations} total, {allocations / args.frames:.1f} per frame")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+"""Micro-benchmark for enemy thinking and steering.
+
+Spawns enemies around a player, most of them within detection range, and
+times ticks of state and velocity updates two ways: a per-enemy loop and
+the batched passes over the EnemyStore (think() then steer(), then
+EnemyGroup.advance() for the walking rows, as the game runs them). The
+per-enemy loop is a frozen copy of the think and move the game ran per
+enemy before batching, kept here as the reference the batched passes must
+match. Neither path hits any obstacles. Reports the end-to-end cost per
+enemy of each path, and the share of it spent in the NumPy passes. It also
+checks that both paths give the same states and velocities.
+
+Usage:
+    python tools/bench_steering.py --enemies 5000 --ticks 100
+"""
+import argparse
+import contextlib
+import io
+import math
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import numpy as np
+import pygame
+from src.enemy import Enemy
+from src.entity_store import EnemyGroup, IDLE, WALK, ATTACK
+from src.spatial import SpatialGroup
+
+class Target:
+    """Stands in for the player: think() only reads its rect"""
+    def __init__(self, x, y):
+        self.rect = pygame.Rect(0, 0, 32, 32)
+        self.rect.center = (x, y)
+
+def reference_think(enemy, target):
+    """Per-enemy think: state, facing and heading from the distance to the target"""
+    center_x, center_y = enemy.rect.center
+    dx = target.rect.centerx - center_x
+    dy = target.rect.centery - center_y
+    distance = math.sqrt(dx * dx + dy * dy)
+    
+    store, index = enemy.store, enemy.index
+    if distance <= store.attack_range[index]:
+        store.state[index] = ATTACK
+    elif distance <= store.detection_range[index]:
+        store.state[index] = WALK
+    else:
+        store.state[index] = IDLE
+    store.facing_right[index] = dx > 0
+    if distance > 0:
+        store.heading_x[index] = dx / distance
+        store.heading_y[index] = dy / distance
+    else:
+        store.heading_x[index] = 1.0
+        store.heading_y[index] = 0.0
+
+def reference_move(enemy, terrain_penalty):
+    """Per-enemy move along the heading, for an empty obstacle group and no flow field"""
+    store, index = enemy.store, enemy.index
+    rect = enemy.bounds()
+    enemy.previous_position = rect.topleft
+    if store.attack_cooldown[index] > 0:
+        store.attack_cooldown[index] -= 1
+    if store.state[index] != WALK:
+        store.velocity_x[index] = 0
+        store.velocity_y[index] = 0
+        return
+    
+    direction = enemy.heading
+    scale = float(store.speed[index]) * terrain_penalty
+    store.velocity_x[index] = direction[0] * scale
+    store.velocity_y[index] = direction[1] * scale
+    rect.x += enemy.velocity_x
+    rect.y += enemy.velocity_y
+    enemy.rect = rect
+
+def spawn(count, seed):
+    """An EnemyGroup of enemies scattered up to 400 px from the origin"""
+    random.seed(seed)
+    group = EnemyGroup()
+    for _ in range(count):
+        angle = random.uniform(0, 2 * math.pi)
+        distance = random.uniform(0, 400)
+        group.add(Enemy(int(math.cos(angle) * distance), int(math.sin(angle) * distance),
+                        random.choice(['enemy1', 'enemy2'])))
+    return group
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark per-enemy against batched enemy steering")
+    parser.add_argument('--enemies', type=int, default=5000)
+    parser.add_argument('--ticks', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=1234)
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    with contextlib.redirect_stdout(io.StringIO()):
+        looped = spawn(args.enemies, args.seed)
+        batched = spawn(args.enemies, args.seed)
+    target = Target(0, 0)
+    obstacles = SpatialGroup()
+    penalties = np.random.default_rng(args.seed).choice([1.0, 0.7, 0.5], args.enemies)
+    penalty_list = penalties.tolist()
+
+    # One tick each way from the same start must agree
+    store = looped.store
+    for enemy in store.views:
+        reference_think(enemy, target)
+        reference_move(enemy, penalty_list[enemy.index])
+    indices = np.arange(args.enemies)
+    batched.store.think(indices, target.rect.center)
+    batched.store.steer(indices, penalties)
+    count = args.enemies
+    states_match = np.array_equal(store.state[:count], batched.store.state[:count])
+    velocity_error = max(np.abs(store.velocity_x[:count] - batched.store.velocity_x[:count]).max(),
+                         np.abs(store.velocity_y[:count] - batched.store.velocity_y[:count]).max())
+
+    # Per-enemy loop
+    start = time.perf_counter()
+    for _ in range(args.ticks):
+        for enemy in store.views:
+            reference_think(enemy, target)
+            reference_move(enemy, penalty_list[enemy.index])
+    loop_elapsed = time.perf_counter() - start
+
+    # Batched passes, then the walking rows move as in the game
+    store = batched.store
+    start = time.perf_counter()
+    steer_elapsed = 0.0
+    for _ in range(args.ticks):
+        steer_start = time.perf_counter()
+        store.think(indices, target.rect.center)
+        walking = store.steer(indices, penalties)
+        steer_elapsed += time.perf_counter() - steer_start
+        batched.advance(walking, obstacles)
+    batch_elapsed = time.perf_counter() - start
+
+    updates = args.enemies * args.ticks
+    walking_share = np.count_nonzero(store.state[:count] == WALK) / count
+    print(f"enemies: {args.enemies}  ticks: {args.ticks}  walking on the last tick: {walking_share:.0%}")
+    print(f"per-enemy loop:  {loop_elapsed / updates * 1e6:.2f} us/enemy, {loop_elapsed / args.ticks * 1000:.2f} ms/tick")
+    print(f"batched + moves: {batch_elapsed / updates * 1e6:.2f} us/enemy, {batch_elapsed / args.ticks * 1000:.2f} ms/tick"
+          f"  ({loop_elapsed / batch_elapsed:.1f}x end to end)")
+    print(f"  of which the NumPy think and steer passes: {steer_elapsed / updates * 1e6:.2f} us/enemy, "
+          f"{steer_elapsed / args.ticks * 1000:.2f} ms/tick")
+    print(f"states match: {states_match}  max velocity difference: {velocity_error:.3g}")
+
+if __name__ == '__main__':
+    main()